@@ -2,29 +2,28 @@ import cv2
 import time
 import numpy as np
 import os
-import insightface
 import pandas as pd
 from datetime import datetime, timedelta
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, Form, Body, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, StreamingResponse
 import json
+import orjson
 import shutil
+import errno
+import zlib
+import mmap
+import struct
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from typing import List, Dict, Optional, Tuple
 import asyncio
 import uvicorn
 from pathlib import Path
-from ultralytics import YOLO
-import torch
-import torchaudio
 import soundfile as sf
 import sounddevice as sd
 import queue
 import threading
-import librosa
-from pydub import AudioSegment
 import warnings
-from transformers import pipeline
 import re
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -35,13 +34,10 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
 import traceback
 import requests
 import base64
+import io
 import logging
 from fastapi.middleware.cors import CORSMiddleware
-import scipy.signal as signal
-from sklearn.cluster import AgglomerativeClustering
-from sklearn.metrics import silhouette_score
 import subprocess
-import xlsxwriter
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -49,25 +45,32 @@ from email.mime.base import MIMEBase
 from email import encoders
 import uuid
 from pydantic import BaseModel, ValidationError
-import speechbrain
-from speechbrain.inference import SpeakerRecognition
 import configparser
 from dotenv import load_dotenv
 import glob
 import tempfile
 import contextlib
+import functools
+from types import MappingProxyType
 import psutil
 import socket
 import sys
-from obsws_python import ReqClient
-import pythoncom
-from pygrabber.dshow_graph import FilterGraph
+from obsws_python import ReqClient, EventClient
+from obsws_python.util import as_dataclass
+from obsws_python.error import OBSSDKTimeoutError
+from websocket import WebSocketTimeoutException
+
+_IS_WIN = sys.platform == "win32"
+_IS_MAC = sys.platform == "darwin"
+if _IS_WIN:
+    import winreg
 
 load_dotenv()
 
+# %(created)f is the record's raw time.time(); %(asctime)s would run localtime + strftime per record
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format='%(created).3f - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler()
     ]
@@ -85,56 +88,166 @@ OBS Recording Integrity Manager
 Ensures safe file handling and prevents corruption
 """
 
+_FTYP = b'ftyp'
+_MP4_BOX_HEADER = struct.Struct('>I4s')  # box size, box type
+
+
 class FileIntegrityManager:
     """Manages OBS file operations with integrity guarantees"""
     
+    COPY_CHUNK_SIZE = 1 << 20  # 1 MiB
+    KERNEL_COPY_CHUNK_SIZE = 1 << 30  # 1 GiB per copy_file_range/sendfile call
+    MMAP_CHECKSUM_THRESHOLD = 64 << 20  # checksum larger files straight from the page cache
+    SAMPLE_CHECKSUM_BLOCKS = 16  # evenly spaced blocks checked after an in-kernel copy (SAMPLED_COPY_VERIFY)
+    SAMPLE_CHECKSUM_BLOCK_SIZE = 64 << 10  # 64 KiB
+    HEADER_SIZE = 12  # size + 'ftyp' + major brand
+    VERIFY_CACHE_SIZE = 32
+    VIDEO_EXTENSIONS = frozenset({'.mp4', '.mkv', '.mov', '.flv', '.avi', '.ts'})
+    
     def __init__(self, obs_client=None):
         self.obs_client = obs_client
+        self.event_client = None
+        self._record_stopped = None
+        self._record_stopped_loop = None
         self.integrity_lock = threading.RLock()
-        self.minimum_finalize_time = 8  # seconds
+        self.minimum_finalize_time = 8  # seconds (upper bound when the output path is known)
+        self.finalize_poll_interval = 0.2  # seconds
+        self._stopped_output_path = None
+        self._finalized = set()  # (path, mtime_ns, size) confirmed closed by OBS
         self.file_check_retries = 5
         self.file_check_delay = 2  # seconds
-        
-    def wait_for_recording_stop(self, timeout: int = 30) -> bool:
+        self._verified = {}  # (path, mtime_ns, size, min_size_kb) of files that passed verification
+        self._cache_lock = threading.Lock()  # _verified/_finalized are shared by io-pool and batch-move threads
+        self._dir_index = {}  # record_dir -> (dir mtime_ns, {path: (mtime, size)})
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="file-io")
+        
+    def attach_event_client(self, event_client):
+        """Subscribe to OBS output events so stop detection doesn't need polling"""
+        self.event_client = event_client
+        if event_client:
+            event_client.callback.register(self.on_record_state_changed)
+    
+    def on_record_state_changed(self, data):
+        """OBS RecordStateChanged callback (runs on the obsws-python event thread)"""
+        if data.output_state != 'OBS_WEBSOCKET_OUTPUT_STOPPED':
+            return
+        self._stopped_output_path = getattr(data, 'output_path', None) or self._stopped_output_path
+        if self._record_stopped is not None and self._record_stopped_loop is not None:
+            self._record_stopped_loop.call_soon_threadsafe(self._record_stopped.set)
+    
+    async def _wait_for_stop_event(self, timeout: float) -> bool:
+        """Wait for RecordStateChanged(STOPPED); falls back to 250ms status polling"""
+        self._record_stopped_loop = asyncio.get_running_loop()
+        self._record_stopped = asyncio.Event()
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                # Checked after arming the event so a stop that already happened isn't missed
+                try:
+                    if not self.obs_client.get_record_status().output_active:
+                        return True
+                except Exception as e:
+                    logger.debug(f"Status check error: {e}")
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                
+                if self.event_client:
+                    try:
+                        await asyncio.wait_for(self._record_stopped.wait(), remaining)
+                        return True
+                    except asyncio.TimeoutError:
+                        return False
+                
+                await asyncio.sleep(min(0.25, remaining))
+        finally:
+            self._record_stopped = None
+            self._record_stopped_loop = None
+    
+    @staticmethod
+    def _cache_path(file_path: str) -> str:
+        return os.path.normcase(os.path.abspath(file_path))
+    
+    @classmethod
+    def _finalize_key(cls, file_path: str, st: os.stat_result) -> Tuple[str, int, int]:
+        return cls._cache_path(file_path), st.st_mtime_ns, st.st_size
+    
+    @staticmethod
+    def _can_open_exclusive(file_path: str) -> bool:
+        try:
+            with open(file_path, 'rb+'):
+                return True
+        except OSError:
+            return False
+    
+    async def _wait_for_file_finalized(self, file_path: str, timeout: float) -> bool:
+        """
+        Poll until two consecutive (size, mtime) samples match and OBS has released the file.
+        Bounded by timeout; returns False if the file never settled.
+        """
+        deadline = time.monotonic() + timeout
+        previous = None
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.finalize_poll_interval)
+            try:
+                st = await self.run_io(os.stat, file_path)
+            except OSError:
+                previous = None
+                continue
+            
+            sample = (st.st_size, st.st_mtime_ns)
+            if sample == previous:
+                # OBS's muxer holds the file exclusively on Windows until the flush completes;
+                # POSIX has no mandatory locks, so there the stable samples are all we can check
+                if _IS_WIN and not await self.run_io(self._can_open_exclusive, file_path):
+                    continue
+                with self._cache_lock:
+                    self._finalized.add(self._finalize_key(file_path, st))
+                return True
+            previous = sample
+        return False
+    
+    async def wait_for_recording_stop(self, timeout: int = 30, output_path: Optional[str] = None) -> bool:
         """
         Safely wait for OBS to stop recording and finalize file
         Returns True if recording stopped cleanly
         """
         if not self.obs_client:
             logger.warning("No OBS client available, using basic wait")
-            time.sleep(self.minimum_finalize_time)
+            await asyncio.sleep(self.minimum_finalize_time)
             return True
             
         try:
             # Phase 1: Wait for OBS to acknowledge stop command
+            self._stopped_output_path = None
             start_time = time.time()
             logger.info("⏳ Waiting for OBS to stop recording...")
             
-            for attempt in range(timeout):
-                try:
-                    status = self.obs_client.get_record_status()
-                    if not status.output_active:
-                        elapsed = time.time() - start_time
-                        logger.info(f"✅ Recording stopped (took {elapsed:.1f}s)")
-                        break
-                except Exception as e:
-                    logger.debug(f"Status check error (attempt {attempt}): {e}")
-                
-                if time.time() - start_time > timeout:
-                    logger.warning(f"⚠️ Stop timeout after {timeout}s")
-                    return False
-                    
-                time.sleep(1)
+            if not await self._wait_for_stop_event(timeout):
+                logger.warning(f"⚠️ Stop timeout after {timeout}s")
+                return False
+            
+            elapsed = time.time() - start_time
+            logger.info(f"✅ Recording stopped (took {elapsed:.1f}s)")
             
             # Phase 2: Wait for file finalization
             logger.info("⏳ Waiting for OBS to finalize recording file...")
-            time.sleep(self.minimum_finalize_time)
+            output_path = output_path or self._stopped_output_path
+            if output_path:
+                finalize_start = time.time()
+                if await self._wait_for_file_finalized(output_path, self.minimum_finalize_time):
+                    logger.info(f"✅ Recording file finalized (took {time.time() - finalize_start:.1f}s)")
+                else:
+                    logger.warning(f"⚠️ Recording file did not settle within {self.minimum_finalize_time}s")
+            else:
+                await asyncio.sleep(self.minimum_finalize_time)
             
             # Phase 3: Verify OBS is ready
             try:
                 # Check if OBS is responsive
                 self.obs_client.get_version()
-                logger.info("✅ OBS is responsive and ready")
+                logger.debug("✅ OBS is responsive and ready")
             except Exception as e:
                 logger.warning(f"⚠️ OBS responsiveness check failed: {e}")
             
@@ -143,7 +256,7 @@ class FileIntegrityManager:
         except Exception as e:
             logger.error(f"❌ Error in recording stop sequence: {e}")
             # Fallback: wait minimum time
-            time.sleep(self.minimum_finalize_time)
+            await asyncio.sleep(self.minimum_finalize_time)
             return True
     
     def verify_file_complete(self, file_path: str, min_size_kb: int = 100) -> Tuple[bool, str]:
@@ -151,13 +264,22 @@ class FileIntegrityManager:
         Verify a file is complete and not corrupted
         Returns (is_valid, error_message)
         """
-        if not os.path.exists(file_path):
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             return False, f"File does not exist: {file_path}"
+        except OSError as e:
+            return False, f"OS error: {e}"
+        
+        cache_key = (self._cache_path(file_path), st.st_mtime_ns, st.st_size, min_size_kb)
+        with self._cache_lock:
+            if cache_key in self._verified:
+                return True, ""
+            finalized = self._finalize_key(file_path, st) in self._finalized
         
         try:
             # Check 1: File size
-            size_bytes = os.path.getsize(file_path)
-            size_kb = size_bytes / 1024
+            size_kb = st.st_size / 1024
             
             if size_kb < min_size_kb:
                 return False, f"File too small: {size_kb:.1f}KB (minimum: {min_size_kb}KB)"
@@ -166,26 +288,38 @@ class FileIntegrityManager:
             if not file_path.lower().endswith('.mp4'):
                 logger.warning(f"⚠️ Non-MP4 file: {file_path}")
             
-            # Check 3: Recent modification time (should be stable)
-            mtime = os.path.getmtime(file_path)
-            time_diff = time.time() - mtime
+            # Check 3: Recent modification time (should be stable), unless OBS already confirmed the close
+            time_diff = time.time() - st.st_mtime
             
-            if time_diff < 3:
+            if time_diff < 3 and not finalized:
                 return False, f"File modified {time_diff:.1f}s ago (may still be writing)"
             
-            # Check 4: File is readable
-            with open(file_path, 'rb') as f:
-                header = f.read(100)  # Read first 100 bytes
-                if len(header) < 100:
-                    return False, "File header incomplete"
-                
-                # Basic MP4 signature check
-                if file_path.lower().endswith('.mp4'):
-                    # MP4 files should start with 'ftyp' at position 4
-                    if len(header) >= 8 and header[4:8] != b'ftyp':
-                        logger.warning("⚠️ File may not be valid MP4 (missing 'ftyp' header)")
-            
-            logger.info(f"✅ File verified: {os.path.basename(file_path)} ({size_kb:.1f}KB)")
+            # Check 4: File is readable (unbuffered, header only)
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                header = os.read(fd, self.HEADER_SIZE)
+            finally:
+                os.close(fd)
+            
+            if len(header) < self.HEADER_SIZE:
+                return False, "File header incomplete"
+            
+            # Basic MP4 signature check
+            if file_path.lower().endswith('.mp4'):
+                # MP4 files should start with a big-endian box size then 'ftyp' at position 4
+                box_size, box_type = _MP4_BOX_HEADER.unpack_from(header)
+                if box_type != _FTYP:
+                    logger.warning("⚠️ File may not be valid MP4 (missing 'ftyp' header)")
+                elif 1 < box_size < _MP4_BOX_HEADER.size:
+                    # 0 (box runs to end of file) and 1 (64-bit largesize follows) are legal ISO-BMFF sizes
+                    return False, f"Truncated MP4 ftyp box (size {box_size})"
+            
+            with self._cache_lock:
+                if len(self._verified) >= self.VERIFY_CACHE_SIZE:
+                    self._verified.clear()
+                self._verified[cache_key] = True
+            
+            logger.debug("✅ File verified: %s (%.1fKB)", os.path.basename(file_path), size_kb)
             return True, ""
             
         except PermissionError as e:
@@ -195,47 +329,114 @@ class FileIntegrityManager:
         except Exception as e:
             return False, f"Unexpected error: {e}"
     
-    def find_stable_recording_file(self, record_dir: str, start_time: float) -> Optional[str]:
+    async def run_io(self, func, *args):
+        """Run blocking disk I/O on the file pool so the event loop stays responsive"""
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, func, *args)
+    
+    async def verify_file_complete_async(self, file_path: str, min_size_kb: int = 100) -> Tuple[bool, str]:
+        return await self.run_io(self.verify_file_complete, file_path, min_size_kb)
+    
+    async def find_stable_recording_file_async(self, record_dir: str, start_time: float,
+                                               fallback_slack: Optional[float] = None) -> Optional[str]:
+        return await self.run_io(self.find_stable_recording_file, record_dir, start_time, fallback_slack)
+    
+    async def safe_move_file_async(self, source_path: str, target_path: str) -> Tuple[bool, str]:
+        return await self.run_io(self.safe_move_file, source_path, target_path)
+    
+    def _snapshot_recordings(self, record_dir: str, start_time: float, slack: float = 10) -> Dict[str, Tuple[float, int]]:
         """
-        Find the latest recording file that has stabilized (not being written to)
+        {path: (mtime, size)} for video files touched since start_time - slack.
+        The directory listing is cached and only re-read when the directory's own mtime changes
+        (a file was added, removed or renamed) or when it holds nothing recent; otherwise just the
+        recent entries are re-stat'ed, since finished recordings don't change.
         """
-        with self.integrity_lock:
-            video_patterns = ['*.mp4', '*.mkv', '*.mov', '*.flv', '*.avi', '*.ts']
-            stable_files = {}
-            
-            # Multiple passes to ensure stability
-            for pass_num in range(3):
-                current_files = {}
-                
-                for pattern in video_patterns:
-                    for file_path in glob.glob(os.path.join(record_dir, pattern)):
-                        try:
-                            mtime = os.path.getmtime(file_path)
-                            size = os.path.getsize(file_path)
-                            
-                            # Only consider files modified after recording start
-                            if mtime > start_time - 10:  # 10 second buffer
-                                current_files[file_path] = (mtime, size)
-                        except (OSError, PermissionError):
+        cutoff = start_time - slack
+        try:
+            dir_mtime = os.stat(record_dir).st_mtime_ns
+        except OSError as e:
+            logger.error(f"❌ Could not scan recording directory {record_dir}: {e}")
+            return {}
+        
+        with self._cache_lock:
+            cached = self._dir_index.get(record_dir)
+        recent = None
+        if cached is not None and cached[0] == dir_mtime:
+            # Refresh a private copy; concurrent callers never mutate the shared index
+            index = dict(cached[1])
+            for path, (mtime, _) in cached[1].items():
+                if mtime <= cutoff:
+                    continue
+                try:
+                    st = os.stat(path, follow_symlinks=False)
+                    index[path] = (st.st_mtime, st.st_size)
+                except OSError:
+                    index.pop(path, None)
+            recent = {path: info for path, info in index.items() if info[0] > cutoff}
+        
+        # FAT/exFAT and SMB shares don't reliably bump the directory mtime on file creation,
+        # so an index with nothing new since the cutoff is rescanned rather than trusted
+        if not recent:
+            index = self._scan_recordings(record_dir)
+            recent = {path: info for path, info in index.items() if info[0] > cutoff}
+        
+        with self._cache_lock:
+            self._dir_index[record_dir] = (dir_mtime, index)
+        
+        # Only consider files modified after recording start
+        return recent
+    
+    def _scan_recordings(self, record_dir: str) -> Dict[str, Tuple[float, int]]:
+        """Single scandir pass: {path: (mtime, size)} for every video file in record_dir"""
+        index = {}
+        extensions = self.VIDEO_EXTENSIONS
+        try:
+            with os.scandir(record_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot < 0 or name[dot:].lower() not in extensions:
+                        continue
+                    try:
+                        # DirEntry caches the stat; don't chase symlinks out of the record dir
+                        if not entry.is_file(follow_symlinks=False):
                             continue
-                
-                if pass_num == 0:
-                    # First pass, just collect
-                    stable_files = current_files.copy()
-                else:
-                    # Check if file sizes have changed
-                    for file_path, (mtime, size) in current_files.items():
-                        if file_path in stable_files:
-                            # Check if size changed
-                            if self._file_changed(file_path, stable_files[file_path][1]):
-                                # Remove from stable list if changed
-                                stable_files.pop(file_path, None)
-                        else:
-                            # New file, add to tracking
-                            stable_files[file_path] = (mtime, size)
-                
-                if pass_num < 2:
-                    time.sleep(2)  # Wait 2 seconds between checks
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    index[entry.path] = (st.st_mtime, st.st_size)
+        except OSError as e:
+            logger.error(f"❌ Could not scan recording directory {record_dir}: {e}")
+        return index
+    
+    def _stable_recordings(self, record_dir: str, start_time: float) -> Dict[str, Tuple[float, int]]:
+        """Two snapshots 2 seconds apart; a file is stable if present in both with unchanged size"""
+        return self._scan_stable(record_dir, start_time)[0]
+    
+    def _scan_stable(self, record_dir: str, start_time: float):
+        """(stable files, latest snapshot) - the snapshot lets callers fall back without rescanning"""
+        first = self._snapshot_recordings(record_dir, start_time)
+        if not first:
+            return {}, first
+        
+        time.sleep(2)
+        second = self._snapshot_recordings(record_dir, start_time)
+        
+        stable = {
+            file_path: info
+            for file_path, info in second.items()
+            if file_path in first and abs(info[1] - first[file_path][1]) <= 1024  # Changed by at most 1KB
+        }
+        return stable, second
+    
+    def find_stable_recording_file(self, record_dir: str, start_time: float,
+                                   fallback_slack: Optional[float] = None) -> Optional[str]:
+        """
+        Find the latest recording file that has stabilized (not being written to).
+        With fallback_slack set, settle for the newest file touched since start_time - fallback_slack
+        when nothing is stable yet (reuses the scan instead of walking the directory again).
+        """
+        with self.integrity_lock:
+            stable_files, snapshot = self._scan_stable(record_dir, start_time)
             
             # Return most recent stable file
             if stable_files:
@@ -243,15 +444,141 @@ class FileIntegrityManager:
                                 key=lambda x: stable_files[x][0])
                 return latest_file
             
+            if fallback_slack is not None:
+                cutoff = start_time - fallback_slack
+                recent = [(info[0], path) for path, info in snapshot.items() if info[0] > cutoff]
+                if recent:
+                    latest_file = max(recent)[1]
+                    logger.warning(f"⚠️ Using fallback file detection: {os.path.basename(latest_file)}")
+                    return latest_file
+            
             return None
     
-    def _file_changed(self, file_path: str, previous_size: int) -> bool:
-        """Check if file has changed since last check"""
-        try:
-            current_size = os.path.getsize(file_path)
-            return abs(current_size - previous_size) > 1024  # Changed by more than 1KB
-        except:
-            return True
+    def process_pending(self, record_dir: str, start_time: float, targets: Dict[str, str],
+                        max_workers: int = 4) -> Dict[str, Tuple[bool, str]]:
+        """
+        Move several finished recordings in one go.
+        targets maps a recording's file name to its destination path; the directory is scanned
+        once and the matching stable files are verified and moved concurrently.
+        Returns {source_path: (success, target_path_or_error)}
+        """
+        with self.integrity_lock:
+            stable_files = self._stable_recordings(record_dir, start_time)
+        
+        pairs = [
+            (file_path, targets[os.path.basename(file_path)])
+            for file_path in stable_files
+            if os.path.basename(file_path) in targets
+        ]
+        missing = set(targets) - {os.path.basename(source) for source, _ in pairs}
+        if missing:
+            logger.warning(f"⚠️ No stable recording found for: {', '.join(sorted(missing))}")
+        if not pairs:
+            return {}
+        
+        # Dedicated pool: this may itself be running on self._io_pool
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs)),
+                                thread_name_prefix="file-batch") as executor:
+            results = list(executor.map(lambda pair: self.safe_move_file(*pair), pairs))
+        
+        moved = sum(1 for success, _ in results if success)
+        logger.info(f"📦 Batch move complete: {moved}/{len(pairs)} recordings moved")
+        return {source: result for (source, _), result in zip(pairs, results)}
+    
+    def _copy_with_checksum(self, source_path: str, target_path: str) -> int:
+        """Copy source to target in one read pass, returning the CRC32 of the data"""
+        crc = 0
+        with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+            while chunk := src.read(self.COPY_CHUNK_SIZE):
+                crc = zlib.crc32(chunk, crc)
+                dst.write(chunk)
+        return crc
+    
+    def _kernel_copy(self, source_path: str, target_path: str) -> bool:
+        """
+        Copy inside the kernel via copy_file_range (reflink on CoW filesystems) or sendfile.
+        Returns True only for a complete copy. Returns False, with the target left empty, when neither
+        copier works for this pair of files or the kernel stops short, so the userspace copy can run.
+        """
+        copiers = []
+        if hasattr(os, 'copy_file_range'):
+            copiers.append(lambda in_fd, out_fd, count: os.copy_file_range(in_fd, out_fd, count))
+        if sys.platform.startswith('linux') and hasattr(os, 'sendfile'):
+            copiers.append(lambda in_fd, out_fd, count: os.sendfile(out_fd, in_fd, None, count))
+        if not copiers:
+            return False
+        
+        with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+            in_fd, out_fd = src.fileno(), dst.fileno()
+            size = os.fstat(in_fd).st_size
+            for copy in copiers:
+                copied = 0
+                try:
+                    while copied < size:
+                        sent = copy(in_fd, out_fd, min(size - copied, self.KERNEL_COPY_CHUNK_SIZE))
+                        if sent == 0:
+                            break
+                        copied += sent
+                except OSError as e:
+                    if copied:
+                        raise
+                    logger.debug(f"Kernel copy unavailable ({e}), trying next method")
+                    dst.truncate(0)
+                    continue
+                if copied == size:
+                    return True
+                # copy_file_range can return 0 at offset 0 for cross-device pairs (shutil falls back too)
+                dst.truncate(0)
+                if copied:
+                    logger.debug(f"Kernel copy stopped at {copied}/{size} bytes, using userspace copy")
+                    return False
+                logger.debug("Kernel copy returned no data, trying next method")
+        return False
+    
+    def _file_checksum(self, file_path: str, use_mmap: Optional[bool] = None) -> int:
+        """CRC32 of a file's contents; large files are mapped rather than read into buffers"""
+        crc = 0
+        with open(file_path, 'rb') as f:
+            if use_mmap is None:
+                use_mmap = os.fstat(f.fileno()).st_size > self.MMAP_CHECKSUM_THRESHOLD
+            if use_mmap:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return zlib.crc32(mapped)
+            while chunk := f.read(self.COPY_CHUNK_SIZE):
+                crc = zlib.crc32(chunk, crc)
+        return crc
+    
+    def _sampled_checksum(self, file_path: str) -> Tuple[int, int]:
+        """(size, CRC32 over the header, tail and evenly spaced blocks) - opt-in cheap check for in-kernel copies"""
+        block = self.SAMPLE_CHECKSUM_BLOCK_SIZE
+        crc = 0
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            last = max(size - block, 0)
+            offsets = sorted({last * i // (self.SAMPLE_CHECKSUM_BLOCKS - 1)
+                              for i in range(self.SAMPLE_CHECKSUM_BLOCKS)})
+            for offset in offsets:
+                f.seek(offset)
+                crc = zlib.crc32(f.read(block), crc)
+        return size, crc
+    
+    def _carry_verification(self, source_path: str, target_path: str):
+        """A rename keeps the bytes, mtime and size, so results verified for source hold for target"""
+        source_key, target_key = self._cache_path(source_path), self._cache_path(target_path)
+        with self._cache_lock:
+            for key in [k for k in self._verified if k[0] == source_key]:
+                self._verified[(target_key,) + key[1:]] = True
+            for key in [k for k in self._finalized if k[0] == source_key]:
+                self._finalized.add((target_key,) + key[1:])
+    
+    def _backup_existing(self, target_path: str) -> Optional[str]:
+        """Move an existing file at target_path aside, returning the backup path"""
+        if not os.path.exists(target_path):
+            return None
+        backup_path = f"{target_path}.backup.{int(time.time())}"
+        shutil.move(target_path, backup_path)
+        logger.info(f"📦 Backed up existing file to: {backup_path}")
+        return backup_path
     
     def safe_move_file(self, source_path: str, target_path: str) -> Tuple[bool, str]:
         """
@@ -267,48 +594,52 @@ class FileIntegrityManager:
                 return False, f"Source file invalid: {error}"
             
             # 2. Ensure target directory exists
-            target_dir = os.path.dirname(target_path)
+            target_dir = os.path.dirname(target_path) or '.'
             os.makedirs(target_dir, exist_ok=True)
             
+            # Fast path: same filesystem means an atomic rename, no data copied
+            if os.stat(source_path).st_dev == os.stat(target_dir).st_dev:
+                try:
+                    self._backup_existing(target_path)
+                    os.replace(source_path, target_path)
+                    self._carry_verification(source_path, target_path)
+                    logger.info(f"✅ File moved successfully (rename): {os.path.basename(target_path)}")
+                    return True, target_path
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    logger.debug("ℹ️ Cross-device move detected, falling back to copy")
+            
             # 3. Create temp file for atomic move
             temp_target = f"{target_path}.moving"
             
-            # 4. Copy with verification
-            shutil.copy2(source_path, temp_target)
-            
-            # 5. Verify copy
-            if not os.path.exists(temp_target):
-                return False, "Copy failed - temp file not created"
-            
-            source_size = os.path.getsize(source_path)
-            copy_size = os.path.getsize(temp_target)
+            # 4. Copy in-kernel where possible, else checksum the source during a userspace copy.
+            # 5. Verify the copy byte-for-byte via full checksums. The kernel copy never passed the
+            # data through userspace, so both files are read back; SAMPLED_COPY_VERIFY trades that
+            # for a size plus sampled-block check that only catches truncation and gross damage
+            if self._kernel_copy(source_path, temp_target):
+                checksum = self._sampled_checksum if config.SAMPLED_COPY_VERIFY else self._file_checksum
+                source_sum = checksum(source_path)
+                copy_sum = checksum(temp_target)
+            else:
+                source_sum = self._copy_with_checksum(source_path, temp_target)
+                copy_sum = self._file_checksum(temp_target)
+            shutil.copystat(source_path, temp_target)
             
-            if source_size != copy_size:
+            if copy_sum != source_sum:
                 os.remove(temp_target)
-                return False, f"Copy size mismatch: {source_size} != {copy_size}"
+                return False, f"Copy checksum mismatch: {source_sum} != {copy_sum}"
             
-            # 6. Atomic rename
-            if os.path.exists(target_path):
-                # Backup existing file
-                backup_path = f"{target_path}.backup.{int(time.time())}"
-                shutil.move(target_path, backup_path)
-                logger.info(f"📦 Backed up existing file to: {backup_path}")
+            # 6. Atomic rename (checksum already proves the content, no re-verify needed)
+            self._backup_existing(target_path)
             
             os.rename(temp_target, target_path)
             
-            # 7. Verify final file
-            is_valid, error = self.verify_file_complete(target_path)
-            if not is_valid:
-                # Try to restore backup if exists
-                if 'backup_path' in locals() and os.path.exists(backup_path):
-                    shutil.move(backup_path, target_path)
-                return False, f"Final file invalid: {error}"
-            
-            # 8. Cleanup source if everything succeeded
+            # 7. Cleanup source if everything succeeded
             try:
                 os.remove(source_path)
-                logger.info(f"🧹 Cleaned up source file: {os.path.basename(source_path)}")
-            except:
+                logger.debug("🧹 Cleaned up source file: %s", os.path.basename(source_path))
+            except OSError:
                 logger.warning(f"⚠️ Could not remove source file: {source_path}")
             
             logger.info(f"✅ File moved successfully: {os.path.basename(target_path)}")
@@ -320,7 +651,7 @@ class FileIntegrityManager:
             if 'temp_target' in locals() and os.path.exists(temp_target):
                 try:
                     os.remove(temp_target)
-                except:
+                except OSError:
                     pass
             return False, str(e)
 
@@ -355,47 +686,125 @@ class RecorderState:
 class CameraDetector:
     """Advanced camera detection with name-based OBS camera finding"""
     
+    DEVICE_TTL = 2.0  # seconds a refresh=True enumeration is still considered fresh
+    _devices = None
+    _devices_at = float('-inf')
+    _com_state = threading.local()
+    _device_list_logged = False
+    # DirectShow enumeration isn't safe to run concurrently; one worker also means one COM init
+    _dshow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dshow")
+    
     @staticmethod
     def _get_devices_safe():
-        """Safely get input devices with proper COM initialization"""
-        pythoncom.CoInitialize()
+        """Safely get input devices with each platform's native enumeration"""
+        if _IS_WIN:
+            return CameraDetector._get_dshow_devices()
+        if _IS_MAC:
+            return CameraDetector._get_avfoundation_devices()
+        return CameraDetector._get_v4l2_devices()
+    
+    @staticmethod
+    def _get_v4l2_devices():
+        """V4L2 device names from sysfs, positioned by /dev/videoN index ('' for gaps)"""
+        devices = []
+        for i in range(CONFIG['camera_scan_range']):
+            try:
+                with open(f'/sys/class/video4linux/video{i}/name', 'r', encoding='utf-8') as f:
+                    devices.append(f.read().strip())
+            except OSError:
+                devices.append('')
+        while devices and not devices[-1]:
+            devices.pop()
+        return devices
+    
+    @staticmethod
+    def _get_avfoundation_devices():
+        """Camera names reported by system_profiler, in AVFoundation order"""
         try:
-            return FilterGraph().get_input_devices()
-        finally:
-            pythoncom.CoUninitialize()
+            output = subprocess.check_output(
+                ['system_profiler', 'SPCameraDataType', '-json'], timeout=10
+            )
+            return [cam.get('_name', '') for cam in orjson.loads(output).get('SPCameraDataType', [])]
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            logger.warning(f"⚠️ Could not enumerate cameras: {e}")
+            return []
+    
+    @staticmethod
+    def _get_dshow_devices():
+        """DirectShow input devices with COM initialized once per thread"""
+        import pythoncom
+        from pygrabber.dshow_graph import FilterGraph
+        if not getattr(CameraDetector._com_state, 'initialized', False):
+            pythoncom.CoInitialize()
+            CameraDetector._com_state.initialized = True
+        return FilterGraph().get_input_devices()
+    
+    @classmethod
+    def cache_clear(cls):
+        """Drop cached devices so the next lookup re-enumerates (e.g. after OBS starts)"""
+        cls._devices = None
+        cls._devices_at = float('-inf')
+    
+    @classmethod
+    def get_video_devices(cls, refresh=False):
+        """
+        Video input devices, enumerated once per process and cached in memory.
+        Not persisted across restarts: devices are plugged and unplugged within a boot.
+        refresh=True re-enumerates unless the cached list is younger than DEVICE_TTL.
+        """
+        if cls._devices is not None:
+            if not refresh or time.monotonic() - cls._devices_at < cls.DEVICE_TTL:
+                return cls._devices
+        
+        cls._devices = CameraDetector._get_devices_safe()
+        cls._devices_at = time.monotonic()
+        return cls._devices
+    
+    @staticmethod
+    async def get_obs_camera_index_async():
+        """get_obs_camera_index on the DirectShow worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(
+            CameraDetector._dshow_executor, CameraDetector.get_obs_camera_index
+        )
     
     @staticmethod
     def get_obs_camera_index():
         """Finds index of camera matching our target name"""
         logger.info(f"🔍 Searching for '{CONFIG['target_camera_name']}'...")
         try:
-            devices = CameraDetector._get_devices_safe()
-            logger.info("📋 Available cameras:")
-            for i, name in enumerate(devices):
-                logger.info(f"  Index {i}: {name}")
-                if CONFIG['target_camera_name'] in name:
-                    logger.info(f"✅ Found matching camera: '{name}' at Index {i}")
-                    return i
+            index = CameraDetector._scan_for_target()
+            if index < 0:
+                index = CameraDetector._scan_for_target(refresh=True)
+            if index >= 0:
+                return index
         except Exception as e:
             logger.error(f"⚠️ Error scanning camera names: {e}")
         
-        # Fallback: Try common OBS Virtual Camera indices
-        for index in [1, 2, 3, 4]:
-            try:
-                cap = cv2.VideoCapture(index)
-                if cap.isOpened():
-                    # Try to get camera name if possible
-                    cap.release()
-                    logger.info(f"📷 Using fallback camera at Index {index}")
-                    return index
-            except:
-                continue
+        logger.warning(f"⚠️ '{CONFIG['target_camera_name']}' not found among video devices")
+        return -1
+    
+    @classmethod
+    def _scan_for_target(cls, refresh=False):
+        """Index of the first device whose name contains the target camera name, or -1"""
+        devices = cls.get_video_devices(refresh=refresh)
+        target = CONFIG['target_camera_name']
+        index = next((i for i, name in enumerate(devices) if target in name), -1)
+        
+        # Full device list once per process; repeat polls only note the count
+        if not cls._device_list_logged:
+            cls._device_list_logged = True
+            logger.info("📋 Available cameras:")
+            for i, name in enumerate(devices):
+                logger.info(f"  Index {i}: {name}")
+        elif index < 0:
+            logger.debug("Still searching (%d devices)", len(devices))
         
-        logger.warning("⚠️ Camera not found by name, defaulting to Index 1")
-        return 1
+        if index >= 0:
+            logger.info(f"✅ Found matching camera: '{devices[index]}' at Index {index}")
+        return index
     
     @staticmethod
-    def find_obs_virtual_camera(timeout=20):
+    async def find_obs_virtual_camera(timeout=20):
         """
         Intelligently find OBS Virtual Camera with name-based detection
         """
@@ -403,153 +812,277 @@ class CameraDetector:
         logger.info("💡 Make sure OBS Virtual Camera is ON in OBS Studio")
         
         start_time = time.time()
+        refresh = False
         
         while time.time() - start_time < timeout:
             try:
-                devices = CameraDetector._get_devices_safe()
-                logger.info(f"📋 Available cameras:")
-                for i, name in enumerate(devices):
-                    logger.info(f"  Index {i}: {name}")
-                    if CONFIG['target_camera_name'] in name:
-                        logger.info(f"✅ Found matching camera: '{name}' at Index {i}")
-                        return i
+                # Cached list on the first pass, fresh enumeration while waiting for the camera
+                # COM enumeration blocks, so it runs off the event loop
+                index = await asyncio.get_running_loop().run_in_executor(
+                    CameraDetector._dshow_executor, CameraDetector._scan_for_target, refresh
+                )
+                refresh = True
+                if index >= 0:
+                    return index
             except Exception as e:
                 logger.error(f"⚠️ Error scanning camera names: {e}")
             
             if time.time() - start_time < timeout - 1:
-                time.sleep(1)
+                await asyncio.sleep(1)
         
         logger.error("❌ No suitable camera found")
         return -1
 
+OBS_UNINSTALL_KEYS = (
+    r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall\OBS Studio",
+    r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall\OBS Studio",
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _discover_obs_path() -> Optional[str]:
+    """Locate the OBS executable once per process (registry first on Windows, then common paths)"""
+    if _IS_WIN:
+        candidates = []
+        for sub_key in OBS_UNINSTALL_KEYS:
+            with contextlib.suppress(OSError):
+                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, sub_key) as key:
+                    install_location, _ = winreg.QueryValueEx(key, "InstallLocation")
+                candidates.append(os.path.join(install_location, "bin", "64bit", "obs64.exe"))
+        candidates += [
+            r"C:\Program Files\obs-studio\bin\64bit\obs64.exe",
+            r"C:\Program Files (x86)\obs-studio\bin\64bit\obs64.exe",
+            os.path.expanduser(r"~\AppData\Local\Programs\obs-studio\bin\64bit\obs64.exe"),
+        ]
+    elif _IS_MAC:
+        candidates = [
+            "/Applications/OBS.app/Contents/MacOS/OBS",
+            "/Applications/OBS Studio.app/Contents/MacOS/OBS",
+        ]
+    else:
+        candidates = [
+            "/usr/bin/obs",
+            "/usr/local/bin/obs",
+            "/snap/bin/obs-studio",
+        ]
+    
+    return next((path for path in candidates if os.path.exists(path)), None)
+
+_INVALID_FN_RE = re.compile(r'[<>:"/\\|?*]')  # Characters Windows rejects in file names
+
 class EnhancedOBSController:
     """Enhanced OBS controller with integrity guarantees"""
     
+    OBS_RUNNING_TTL = 2.0  # seconds
+    WS_CONFIG_STAMP = ".meetingsense_wscfg"
+    _OBS_NAME_RE = re.compile(r'obs(?:64|-studio)', re.IGNORECASE)
+    _known_dirs = set()  # recording folders already created this process
+    
     def __init__(self, obs_path=None):
         self.client = None
-        self.state = RecorderState.DISCONNECTED
+        self.event_client = None
+        self._state = RecorderState.DISCONNECTED
         self.obs_process = None
         self.obs_started_by_us = False
         self.obs_path = obs_path or self._find_obs_path()
         self.recording_target = None
         self.last_recording_path = None
-        self._event_callbacks = {}
+        # Copy-on-write tuples: dispatch reads a snapshot, registration swaps in a new tuple
+        self._event_callbacks: Dict[str, tuple] = {}
+        self._state_cbs = ()  # 'state_changed' handlers, refreshed by on()
         self.recording_start_time = None
         self.integrity_manager = FileIntegrityManager()
+        self._connect_lock = asyncio.Lock()
+        self._last_obs_pids = (float('-inf'), [])  # (monotonic time, OBS pids)
+        self._obs_ini_checked = None  # "mtime_ns:size" of a global.ini already known good
+        self._record_dir_cache: Optional[str] = None
+        self._rpc_lock = threading.Lock()  # every OBS request/response pair on the shared socket holds this
         
         if self.obs_path:
             logger.info(f"✅ Found OBS at: {self.obs_path}")
         else:
             logger.warning("⚠️ OBS Studio not found automatically")
     
-    def set_obs_client(self, client):
-        """Set the OBS WebSocket client for integrity checks"""
+    def set_obs_client(self, client, event_client=None):
+        """Set the OBS WebSocket clients for integrity checks"""
+        if client is not None:
+            self._guard_rpc(client)
         self.integrity_manager.obs_client = client
+        self.integrity_manager.attach_event_client(event_client)
         self.client = client
+        self.event_client = event_client
+        self._record_dir_cache = None  # New connection, OBS settings may have changed
     
-    def _find_obs_path(self):
-        """Find OBS Studio installation path for version 32"""
-        import platform
-        system = platform.system()
-        
-        if system == "Windows":
-            common_paths = [
-                r"C:\Program Files\obs-studio\bin\64bit\obs64.exe",
-                r"C:\Program Files (x86)\obs-studio\bin\64bit\obs64.exe",
-                os.path.expanduser(r"~\AppData\Local\Programs\obs-studio\bin\64bit\obs64.exe"),
-            ]
+    def _get_record_directory(self) -> str:
+        """OBS recording directory, fetched once per connection"""
+        if self._record_dir_cache is None:
+            self._record_dir_cache = self.client.get_record_directory().record_directory
+        return self._record_dir_cache
+    
+    def _client_alive(self) -> bool:
+        """Cheap liveness check on the existing websocket, no request round-trip"""
+        ws = getattr(getattr(self.client, 'base_client', None), 'ws', None)
+        return bool(ws is not None and ws.connected)
+    
+    async def ensure_connected(self) -> bool:
+        """Reuse the long-lived ReqClient; reconnect only if its websocket has dropped"""
+        async with self._connect_lock:
+            if self.client is not None and self._client_alive():
+                return True
             
-            # Try to find from registry
-            try:
-                import winreg
-                try:
-                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                                        r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall\OBS Studio")
-                    install_location, _ = winreg.QueryValueEx(key, "InstallLocation")
-                    winreg.CloseKey(key)
-                    obs_exe = os.path.join(install_location, "bin", "64bit", "obs64.exe")
-                    if os.path.exists(obs_exe):
-                        common_paths.insert(0, obs_exe)
-                except:
-                    pass
-                
-                # Try 32-bit registry
-                try:
-                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                                        r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall\OBS Studio")
-                    install_location, _ = winreg.QueryValueEx(key, "InstallLocation")
-                    winreg.CloseKey(key)
-                    obs_exe = os.path.join(install_location, "bin", "64bit", "obs64.exe")
-                    if os.path.exists(obs_exe):
-                        common_paths.insert(0, obs_exe)
-                except:
-                    pass
-            except:
-                pass
+            if self.client is not None:
+                logger.warning("⚠️ OBS websocket dropped, reconnecting...")
+                if self.event_client:
+                    try:
+                        self.event_client.disconnect()
+                    except Exception:
+                        pass
+                self.set_obs_client(None)
+            self.state = RecorderState.DISCONNECTED
             
-        elif system == "Darwin":
-            common_paths = [
-                "/Applications/OBS.app/Contents/MacOS/OBS",
-                "/Applications/OBS Studio.app/Contents/MacOS/OBS",
-            ]
-        else:
-            common_paths = [
-                "/usr/bin/obs",
-                "/usr/local/bin/obs",
-                "/snap/bin/obs-studio",
-            ]
-        
-        for path in common_paths:
-            if os.path.exists(path):
-                return path
-        
-        return None
+            return await self.connect_async()
+    
+    def _find_obs_path(self):
+        """Find OBS Studio installation path for version 32"""
+        return _discover_obs_path()
     
     def on(self, event, callback):
         """Register event callback"""
-        if event not in self._event_callbacks:
-            self._event_callbacks[event] = []
-        self._event_callbacks[event].append(callback)
+        callbacks = (*self._event_callbacks.get(event, ()), callback)
+        self._event_callbacks[event] = callbacks
+        if event == 'state_changed':
+            self._state_cbs = callbacks
     
-    def _trigger_event(self, event, *args, **kwargs):
+    def _trigger_event(self, event, *args):
         """Trigger event callbacks"""
-        if event in self._event_callbacks:
-            for callback in self._event_callbacks[event]:
-                try:
-                    callback(*args, **kwargs)
-                except Exception as e:
-                    logger.error(f"⚠️ Event callback error: {e}")
+        callbacks = self._event_callbacks.get(event)
+        if not callbacks:
+            return
+        for callback in callbacks:
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f"⚠️ Event callback error: {e}")
+    
+    @property
+    def state(self):
+        return self._state
+    
+    @state.setter
+    def state(self, value):
+        """Every transition notifies 'state_changed' listeners; no-op transitions are dropped"""
+        if value != self._state:
+            self._state = value
+            self._emit_state()
+    
+    def _emit_state(self):
+        """Fast path for the hot 'state_changed' event"""
+        if not self._state_cbs:
+            return
+        state = self.state
+        for callback in self._state_cbs:
+            try:
+                callback(state)
+            except Exception as e:
+                logger.error(f"⚠️ Event callback error: {e}")
     
     def _check_port_open(self, port):
         """Check if a port is open"""
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('localhost', port))
-            sock.close()
-            return result == 0
-        except:
+            # localhost: a refused or silent port answers well within 200ms
+            with socket.create_connection(('localhost', port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+    
+    async def _probe_port(self, port, timeout=1.0):
+        """Non-blocking check that something is accepting connections on localhost:port"""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection('localhost', port), timeout)
+        except (OSError, asyncio.TimeoutError):
             return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
     
-    def _is_obs_running(self):
-        """Check if OBS is running"""
+    def _find_obs_pids(self) -> List[int]:
+        """PIDs of running OBS processes (one process walk, cached for OBS_RUNNING_TTL seconds)"""
+        checked_at, pids = self._last_obs_pids
+        now = time.monotonic()
+        if now - checked_at < self.OBS_RUNNING_TTL:
+            return pids
+        
+        if sys.platform.startswith('linux'):
+            pids = self._scan_proc_for_obs()
+            self._last_obs_pids = (now, pids)
+            return pids
+        
+        pids = []
+        match_obs = self._OBS_NAME_RE.search
         try:
             for process in psutil.process_iter(['pid', 'name']):
                 try:
                     name = process.info['name']
-                    if name and ('obs64' in name.lower() or 'obs-studio' in name.lower()):
-                        return True
+                    if name and match_obs(name):
+                        pids.append(process.info['pid'])
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
         except Exception as e:
             logger.error(f"⚠️ Process check error: {e}")
-        return False
+        
+        self._last_obs_pids = (now, pids)
+        return pids
+    
+    @classmethod
+    def _scan_proc_for_obs(cls) -> List[int]:
+        """Linux fast path: read /proc/<pid>/comm directly instead of a full psutil walk"""
+        pids = []
+        match_obs = cls._OBS_NAME_RE.search
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/comm', 'rb') as f:
+                    name = f.read().strip()
+            except OSError:  # Process exited or is inaccessible
+                continue
+            if match_obs(name.decode('utf-8', 'replace')):
+                pids.append(int(entry))
+        return pids
+    
+    def _is_obs_running(self):
+        """Check if OBS is running"""
+        return bool(self._find_obs_pids())
+    
+    def _wait_for_obs_exit(self, pids, timeout):
+        """Wait on the given OBS PIDs directly; returns the psutil.Process objects still alive"""
+        procs = []
+        for pid in pids:
+            with contextlib.suppress(psutil.NoSuchProcess):
+                procs.append(psutil.Process(pid))
+        _, alive = psutil.wait_procs(procs, timeout=timeout)
+        self._invalidate_obs_running()
+        return alive
+    
+    @staticmethod
+    def _wait_for_process_exit(proc, timeout=5.0) -> bool:
+        """Block until proc exits or timeout elapses; returns True if it exited"""
+        try:
+            proc.wait(timeout=timeout)
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+    
+    def _invalidate_obs_running(self):
+        """Force the next _is_obs_running call to rescan processes"""
+        self._last_obs_pids = (float('-inf'), [])
     
     def _clean_obs_crash_flag(self):
         """Remove OBS crash flag to prevent safe mode prompt"""
-        import platform
-        
-        if platform.system() != "Windows":
+        if not _IS_WIN:
             return
         
         try:
@@ -561,18 +1094,17 @@ class EnhancedOBSController:
                 os.remove(crash_flag_path)
                 logger.info("✅ Crash flag removed")
             
-            # Also check for crash reports
+            # Also check for crash reports (scandir entries carry type/stat, one syscall per file)
             crash_reports_dir = os.path.join(config_dir, "crashes")
-            if os.path.exists(crash_reports_dir):
+            if os.path.isdir(crash_reports_dir):
                 try:
                     now = time.time()
-                    for file in os.listdir(crash_reports_dir):
-                        file_path = os.path.join(crash_reports_dir, file)
-                        if os.path.isfile(file_path):
-                            if now - os.path.getmtime(file_path) < 86400:
-                                os.remove(file_path)
-                                logger.info(f"✅ Removed crash report: {file}")
-                except:
+                    with os.scandir(crash_reports_dir) as entries:
+                        for entry in entries:
+                            if entry.is_file(follow_symlinks=False) and now - entry.stat().st_mtime < 86400:
+                                os.remove(entry.path)
+                                logger.info(f"✅ Removed crash report: {entry.name}")
+                except OSError:
                     pass
                     
         except Exception as e:
@@ -580,9 +1112,7 @@ class EnhancedOBSController:
     
     def _configure_obs_websocket_for_32(self):
         """Configure OBS WebSocket for version 32"""
-        import platform
-        
-        if platform.system() != "Windows":
+        if not _IS_WIN:
             return True
         
         try:
@@ -613,68 +1143,87 @@ AuthRequired=false
                 logger.info("✅ Created new OBS config with WebSocket enabled")
                 return True
             
-            # Read existing config
-            with open(config_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            websocket_section = False
-            needs_update = False
-            
-            for i, line in enumerate(lines):
-                stripped = line.strip()
-                
-                if stripped == '[OBSWebSocket]':
-                    websocket_section = True
-                elif websocket_section and stripped.startswith('['):
-                    websocket_section = False
-                elif websocket_section:
-                    if stripped.startswith('ServerEnabled='):
-                        if 'false' in stripped.lower():
-                            lines[i] = 'ServerEnabled=true\n'
-                            needs_update = True
-                    elif stripped.startswith('ServerPort='):
-                        if '4455' not in stripped:
-                            lines[i] = 'ServerPort=4455\n'
-                            needs_update = True
-                    elif stripped.startswith('AuthRequired='):
-                        if 'true' in stripped.lower():
-                            lines[i] = 'AuthRequired=false\n'
-                            needs_update = True
-            
-            # Add section if missing
-            if not websocket_section:
-                logger.info("➕ Adding OBSWebSocket section to config...")
-                lines.extend([
-                    '\n',
-                    '[OBSWebSocket]\n',
-                    'ServerEnabled=true\n',
-                    'ServerPort=4455\n',
-                    'AuthRequired=false\n',
-                    'DebugEnabled=false\n',
-                    'AlertsEnabled=false\n'
-                ])
-                needs_update = True
+            # Skip the parse entirely if the file hasn't changed since we last confirmed it,
+            # in this process or a previous one (stamp file next to global.ini)
+            stamp_path = os.path.join(os.path.dirname(config_path), self.WS_CONFIG_STAMP)
+            st = os.stat(config_path)
+            stamp = f"{st.st_mtime_ns}:{st.st_size}"
+            if self._obs_ini_checked is None:
+                try:
+                    with open(stamp_path, 'r', encoding='utf-8') as f:
+                        self._obs_ini_checked = f.read().strip()
+                except OSError:
+                    self._obs_ini_checked = ""
+            if self._obs_ini_checked == stamp:
+                logger.debug("✅ Configuration already correct (unchanged)")
+                return True
             
-            if needs_update:
-                logger.info("📝 Updating OBS WebSocket configuration...")
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-                logger.info("✅ Configuration updated")
-            else:
-                logger.info("✅ Configuration already correct")
+            # Changed since the last confirmation: check the [OBSWebSocket] section itself,
+            # since a bare substring test would match keys from other sections or ports like 44550
+            with open(config_path, 'rb') as f:
+                raw = f.read()
+            if self._apply_websocket_config(config_path, raw):
+                st = os.stat(config_path)
             
+            self._obs_ini_checked = f"{st.st_mtime_ns}:{st.st_size}"
+            try:
+                with open(stamp_path, 'w', encoding='utf-8') as f:
+                    f.write(self._obs_ini_checked)
+            except OSError as e:
+                logger.debug(f"Could not write config stamp: {e}")
             return True
             
         except Exception as e:
             logger.error(f"⚠️ Config update failed: {e}")
             return False
     
-    def _launch_obs_32(self):
+    def _apply_websocket_config(self, config_path, raw: bytes) -> bool:
+        """Parse global.ini and enable the WebSocket server; returns True if the file was rewritten"""
+        parser = configparser.ConfigParser(strict=False, interpolation=None)
+        parser.optionxform = str  # OBS keys are case-sensitive
+        parser.read_string(raw.decode('utf-8-sig'), source=config_path)
+        
+        if not parser.has_section('OBSWebSocket'):
+            logger.info("➕ Adding OBSWebSocket section to config...")
+            parser.add_section('OBSWebSocket')
+        
+        section = parser['OBSWebSocket']
+        wanted = {
+            'ServerEnabled': 'true',
+            'ServerPort': '4455',
+            'AuthRequired': 'false',
+        }
+        needs_update = False
+        for key, value in wanted.items():
+            if section.get(key, '').strip().lower() != value:
+                section[key] = value
+                needs_update = True
+        for key in ('DebugEnabled', 'AlertsEnabled'):
+            if key not in section:
+                section[key] = 'false'
+                needs_update = True
+        
+        if needs_update:
+            logger.info("📝 Updating OBS WebSocket configuration...")
+            with open(config_path, 'w', encoding='utf-8') as f:
+                parser.write(f, space_around_delimiters=False)
+            logger.info("✅ Configuration updated")
+        else:
+            logger.info("✅ Configuration already correct")
+        return needs_update
+    
+    async def _launch_obs_32(self):
         """Launch OBS Studio 32.0.2 with proper settings"""
         if not self.obs_path:
             logger.error("❌ OBS Studio path not found")
             return False
         
+        # An OBS already serving the WebSocket needs no crash-flag cleanup or config rewrite
+        if await self._probe_port(CONFIG['obs_websocket_port']):
+            logger.info("ℹ️ OBS already running with WebSocket ready (will NOT close later)")
+            self.obs_started_by_us = False
+            return True
+        
         # Clean crash flag first
         self._clean_obs_crash_flag()
         
@@ -685,81 +1234,94 @@ AuthRequired=false
         logger.info("🚀 Launching OBS Studio 32.0.2...")
         
         try:
-            # Check if OBS is already running
             if self._is_obs_running():
                 logger.info("ℹ️ OBS already running (will NOT close later)")
                 self.obs_started_by_us = False
                 # Wait a bit and check WebSocket
-                time.sleep(3)
-                return self._wait_for_websocket()
+                await asyncio.sleep(3)
+                return await self._wait_for_websocket()
             
             # OBS 32.0.2 command-line arguments
-            obs_dir = os.path.dirname(self.obs_path)
-            
-            if sys.platform == "win32":
+            if _IS_WIN:
                 cmd = [
                     self.obs_path,
                     "--minimize-to-tray",
                     "--disable-updater"
                 ]
+                # cwd must stay the bin dir: Windows OBS resolves its locale/data files relative to it
                 self.obs_process = subprocess.Popen(
                     cmd,
-                    cwd=obs_dir,
+                    cwd=os.path.dirname(self.obs_path),
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL,
-                    creationflags=subprocess.CREATE_NO_WINDOW
+                    close_fds=True,
+                    creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
                 )
-            elif sys.platform == "darwin":
+            elif _IS_MAC:
                 cmd = ["open", "-a", "OBS Studio", "--args", "--minimize-to-tray", "--disable-updater"]
                 self.obs_process = subprocess.Popen(cmd)
             else:
                 cmd = [self.obs_path, "--minimize-to-tray", "--disable-updater"]
                 self.obs_process = subprocess.Popen(
                     cmd,
-                    cwd=obs_dir,
                     stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
+                    stderr=subprocess.DEVNULL,
+                    close_fds=True,
+                    start_new_session=True
                 )
             
             self.obs_started_by_us = True
+            self._invalidate_obs_running()
+            CameraDetector.cache_clear()
             logger.info(f"✅ OBS 32.0.2 launched (PID: {self.obs_process.pid})")
             
             # Give OBS more time to start
             logger.info("⏳ Waiting for OBS to fully start...")
-            time.sleep(5)
+            await asyncio.sleep(5)
             
-            return self._wait_for_websocket(45)
+            return await self._wait_for_websocket(45)
             
         except Exception as e:
             logger.error(f"❌ Failed to launch OBS: {e}")
             self.obs_started_by_us = False
             return False
     
-    def _wait_for_websocket(self, timeout=45):
+    async def _wait_for_websocket(self, timeout=45):
         """Wait for OBS WebSocket to be ready"""
         logger.info(f"⏳ Waiting for OBS WebSocket (max {timeout}s)...")
-        start_time = time.time()
         
-        while time.time() - start_time < timeout:
-            if self._check_port_open(CONFIG['obs_websocket_port']):
-                logger.info("✅ OBS WebSocket ready")
-                return True
-            
-            # Check if OBS process is still running
-            if self.obs_process and self.obs_process.poll() is not None:
-                logger.error("❌ OBS process died")
-                return False
-            
-            time.sleep(1)
+        async def probe_loop():
+            # Back off from 100ms to 1s so a quick OBS start is noticed within a fraction of a second
+            delay = 0.1
+            while True:
+                if await self._probe_port(CONFIG['obs_websocket_port'], timeout=0.2):
+                    logger.info("✅ OBS WebSocket ready")
+                    return True
+                
+                # Check if OBS process is still running
+                if self.obs_process and self.obs_process.poll() is not None:
+                    logger.error("❌ OBS process died")
+                    return False
+                
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, 1.0)
         
-        logger.error("⚠️ OBS WebSocket timeout")
-        return False
+        try:
+            return await asyncio.wait_for(probe_loop(), timeout)
+        except asyncio.TimeoutError:
+            logger.error("⚠️ OBS WebSocket timeout")
+            return False
     
     def _shutdown_obs_gracefully(self):
         """Shutdown OBS using the shutdown plugin for OBS 32+"""
         try:
             logger.info("🔌 Closing OBS Studio via shutdown plugin...")
             
+            # One process walk up front; later checks wait on these PIDs instead of rescanning
+            self._invalidate_obs_running()
+            obs_pids = self._find_obs_pids()
+            alive = None
+            
             if self.client:
                 # 1. Stop recording safely
                 try:
@@ -808,9 +1370,9 @@ AuthRequired=false
                         })
                         logger.info(f"✅ Shutdown command sent (fallback): {response}")
                     
-                    # Give OBS time to close
+                    # Give OBS time to close (returns as soon as the processes exit)
                     logger.info("⏳ Waiting for OBS to close gracefully...")
-                    time.sleep(5)
+                    alive = self._wait_for_obs_exit(obs_pids, 5)
                     
                 except Exception as e:
                     logger.error(f"⚠️ Plugin shutdown failed: {e}")
@@ -818,20 +1380,23 @@ AuthRequired=false
                     logger.info("   Using fallback termination...")
             
             # 5. Fallback if plugin didn't work or OBS still running
+            if alive is None:
+                alive = self._wait_for_obs_exit(obs_pids, 0)
             if self.obs_started_by_us and self.obs_process:
-                if self._is_obs_running():
+                if alive:
                     logger.info("🛑 OBS still running, terminating process...")
                     try:
                         self.obs_process.terminate()
                         self.obs_process.wait(timeout=10)
                         logger.info("✅ OBS terminated")
-                    except:
+                    except (subprocess.TimeoutExpired, OSError):
                         try:
                             self.obs_process.kill()
                             self.obs_process.wait(timeout=5)
                             logger.info("✅ OBS killed")
                         except Exception as e:
                             logger.error(f"❌ Could not terminate OBS: {e}")
+                    self._invalidate_obs_running()
             
             # 6. Clean crash flags regardless of shutdown method
             logger.info("🧹 Cleaning OBS crash flags...")
@@ -874,14 +1439,13 @@ AuthRequired=false
             logger.info("      You should see 'Shutdown Plugin' section")
             return False
     
-    def connect(self):
+    async def connect_async(self):
         """Connect to OBS Studio"""
         if self.state != RecorderState.DISCONNECTED:
             logger.warning(f"⚠️ Already in state: {self.state}")
             return True
         
         self.state = RecorderState.CONNECTING
-        self._trigger_event('state_changed', self.state)
         
         max_attempts = 2
         
@@ -889,35 +1453,48 @@ AuthRequired=false
             try:
                 logger.info(f"\n🔄 Connection attempt {attempt + 1}/{max_attempts}")
                 
-                # Check if OBS is running
-                if not self._is_obs_running():
+                # Check if OBS is running: an open WebSocket port settles it without a process scan
+                if await self._probe_port(CONFIG['obs_websocket_port']):
+                    logger.debug("OBS WebSocket already listening")
+                elif not self._is_obs_running():
                     logger.info("OBS not running, launching...")
-                    if not self._launch_obs_32():
+                    if not await self._launch_obs_32():
                         if attempt == max_attempts - 1:
                             logger.error("❌ Failed to launch OBS")
                             self.state = RecorderState.ERROR
-                            self._trigger_event('state_changed', self.state)
                             return False
                         continue
                 
                 # Connect via WebSocket
                 logger.info(f"🔗 Connecting to WebSocket (localhost:{CONFIG['obs_websocket_port']})...")
-                self.client = ReqClient(
+                loop = asyncio.get_running_loop()
+                self.client = self._guard_rpc(await loop.run_in_executor(None, lambda: ReqClient(
                     host='localhost',
                     port=CONFIG['obs_websocket_port'],
                     password=CONFIG['obs_websocket_password'],
                     timeout=15
-                )
+                )))
                 
                 # Test connection
                 version = self.client.get_version()
                 logger.info(f"✅ Connected to OBS v{version.obs_version}")
                 
+                # Event client lets stop detection wake on RecordStateChanged
+                try:
+                    event_client = await loop.run_in_executor(None, lambda: EventClient(
+                        host='localhost',
+                        port=CONFIG['obs_websocket_port'],
+                        password=CONFIG['obs_websocket_password'],
+                        timeout=15
+                    ))
+                except Exception as e:
+                    logger.warning(f"⚠️ OBS event client unavailable, stop detection will poll: {e}")
+                    event_client = None
+                
                 # Set client for integrity manager
-                self.set_obs_client(self.client)
+                self.set_obs_client(self.client, event_client)
                 
                 self.state = RecorderState.CONNECTED
-                self._trigger_event('state_changed', self.state)
                 self._trigger_event('connected', version)
                 
                 return True
@@ -927,7 +1504,7 @@ AuthRequired=false
                 
                 if attempt < max_attempts - 1:
                     logger.info(f"Retrying in 5 seconds...")
-                    time.sleep(5)
+                    await asyncio.sleep(5)
                 else:
                     logger.error("❌ All connection attempts failed")
                     logger.info("\n💡 TROUBLESHOOTING for OBS 32.0.2:")
@@ -939,11 +1516,10 @@ AuthRequired=false
                     logger.info("   6. Click OK and restart OBS")
                     logger.info("   7. Try connecting again")
                     self.state = RecorderState.ERROR
-                    self._trigger_event('state_changed', self.state)
         
         return False
 
-    def ensure_virtual_camera_active(self):
+    async def ensure_virtual_camera_active(self):
         """Ensure OBS Virtual Camera is active for live feed"""
         if not self.client:
             return False
@@ -961,7 +1537,7 @@ AuthRequired=false
                     if vcam_status.output_active:
                         logger.info("✅ OBS Virtual Camera ACTIVE")
                         return True
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                 
                 logger.warning("⚠️ Virtual camera might not be fully active")
                 return False
@@ -971,7 +1547,7 @@ AuthRequired=false
             logger.error(f"❌ Error ensuring virtual camera: {e}")
             return False
     
-    def start_virtual_camera(self):
+    async def start_virtual_camera(self):
         """Start OBS Virtual Camera - OBS 32 version"""
         if self.state not in [RecorderState.CONNECTED, RecorderState.VIRTUAL_CAM_ACTIVE]:
             logger.error(f"❌ Cannot start virtual camera in state: {self.state}")
@@ -994,18 +1570,16 @@ AuthRequired=false
                 if status.output_active:
                     logger.info("✅ Virtual Camera ACTIVE")
                     self.state = RecorderState.VIRTUAL_CAM_ACTIVE
-                    self._trigger_event('state_changed', self.state)
                     self._trigger_event('virtual_cam_started')
                     return True
             except Exception as e:
                 logger.warning(f"⚠️ Status check failed: {e}")
             
-            time.sleep(1)
+            await asyncio.sleep(1)
         
         logger.warning("⚠️ Virtual camera might not be fully active")
         logger.info("💡 Please check OBS and ensure Virtual Camera is enabled")
         self.state = RecorderState.VIRTUAL_CAM_ACTIVE  # Assume active
-        self._trigger_event('state_changed', self.state)
         return True
     
     def setup_recording_camera(self, camera_index=0):
@@ -1014,32 +1588,99 @@ AuthRequired=false
         logger.info("💡 OBS should already have camera and audio sources configured")
         return True
     
-    def _check_obs_recording_ready(self) -> bool:
+    @staticmethod
+    def _exchange(ws, payload, response_op):
+        """
+        Send one request frame and read until the response carrying its requestId arrives.
+        Caller must hold _rpc_lock; frames that do not match (stale replies) are dropped.
+        """
+        request_id = payload["d"]["requestId"]
+        try:
+            ws.send(orjson.dumps(payload).decode())
+            while True:
+                message = orjson.loads(ws.recv())
+                if message.get("op") == response_op and message.get("d", {}).get("requestId") == request_id:
+                    return message["d"]
+                logger.debug(f"Dropping unmatched OBS frame (op {message.get('op')})")
+        except WebSocketTimeoutException as e:
+            raise OBSSDKTimeoutError("Timeout while trying to send the request") from e
+    
+    def _guard_rpc(self, client):
+        """
+        Route every ReqClient request through _rpc_lock with requestId matching.
+        obsws_python's own req() does an unlocked send/recv, so threads sharing the socket could swap replies.
+        """
+        base = client.base_client
+        if getattr(base, '_rpc_guarded', False):
+            return client
+        
+        def req(req_type, req_data=None):
+            payload = {"op": 6, "d": {"requestType": req_type, "requestId": uuid.uuid4().hex}}
+            if req_data:
+                payload["d"]["requestData"] = req_data
+            with self._rpc_lock:
+                return self._exchange(base.ws, payload, 7)  # 6 Request -> 7 RequestResponse
+        
+        base.req = req
+        base._rpc_guarded = True
+        return client
+    
+    def _request_batch(self, *request_types):
+        """
+        Send parameterless OBS requests as one RequestBatch (a single WebSocket round trip).
+        Results come back in request order as the same dataclasses ReqClient returns;
+        a failed request is returned as an exception instance rather than raised.
+        """
+        payload = {
+            "op": 8,  # RequestBatch
+            "d": {
+                "requestId": uuid.uuid4().hex,
+                "haltOnFailure": False,
+                "requests": [{"requestType": t, "requestId": str(i)} for i, t in enumerate(request_types)],
+            },
+        }
+        with self._rpc_lock:
+            response = self._exchange(self._guard_rpc(self.client).base_client.ws, payload, 9)  # 8 -> 9 RequestBatchResponse
+        
+        results = []
+        for result in response["results"]:
+            status = result["requestStatus"]
+            if status["result"]:
+                results.append(as_dataclass(result["requestType"], result.get("responseData", {})))
+            else:
+                results.append(RuntimeError(
+                    f"{result['requestType']} failed ({status['code']}): {status.get('comment', '')}"
+                ))
+        return results
+    
+    async def _check_obs_recording_ready(self) -> bool:
         """Check if OBS is ready to record"""
+        loop = asyncio.get_running_loop()
         try:
-            # Check recording status
-            record_status = self.client.get_record_status()
+            # Status, version and record directory in one batched round trip
+            record_status, version, record_dir = await loop.run_in_executor(
+                None, self._request_batch, 'GetRecordStatus', 'GetVersion', 'GetRecordDirectory'
+            )
+            if isinstance(record_status, Exception):
+                raise record_status
             
             if record_status.output_active:
                 logger.warning("⚠️ OBS is already recording")
                 return False
             
-            # Check OBS version
-            version = self.client.get_version()
+            if isinstance(version, Exception):
+                raise version
             logger.info(f"📋 OBS Version: {version.obs_version}")
             
             # Check available disk space in recording directory
-            try:
-                record_dir = self.client.get_record_directory().record_directory
-                free_space = shutil.disk_usage(record_dir).free / (1024**3)  # GB
-                
+            if not isinstance(record_dir, Exception):  # Disk check optional
+                record_dir = self._record_dir_cache = record_dir.record_directory
+                free_space = (await loop.run_in_executor(None, shutil.disk_usage, record_dir)).free / (1024**3)
                 if free_space < 1.0:  # Less than 1GB free
                     logger.warning(f"⚠️ Low disk space: {free_space:.1f}GB free")
                     return False
                 
                 logger.info(f"💾 Disk space: {free_space:.1f}GB free in {record_dir}")
-            except:
-                pass  # Disk check optional
             
             return True
             
@@ -1047,7 +1688,16 @@ AuthRequired=false
             logger.error(f"❌ OBS readiness check failed: {e}")
             return False
     
-    def start_recording(self, folder_path=None, filename=None):
+    async def _poll_output(self, get_status, active: bool, timeout: float, interval: float = 0.05):
+        """Poll an OBS output status until output_active == active or timeout; returns the last status"""
+        deadline = time.monotonic() + timeout
+        while True:
+            status = get_status()
+            if status.output_active == active or time.monotonic() >= deadline:
+                return status
+            await asyncio.sleep(interval)
+    
+    async def start_recording(self, folder_path=None, filename=None):
         """Start recording with pre-flight checks"""
         if self.state not in [RecorderState.CONNECTED, RecorderState.VIRTUAL_CAM_ACTIVE]:
             logger.error(f"❌ Cannot start recording in state: {self.state}")
@@ -1055,7 +1705,7 @@ AuthRequired=false
         
         try:
             # Pre-flight checks
-            if not self._check_obs_recording_ready():
+            if not await self._check_obs_recording_ready():
                 return False, "OBS not ready for recording"
             
             if folder_path and filename:
@@ -1066,7 +1716,7 @@ AuthRequired=false
             # FIX 1: Ensure virtual camera is started BEFORE recording
             if self.state != RecorderState.VIRTUAL_CAM_ACTIVE:
                 logger.info("📷 Starting OBS Virtual Camera for live feed...")
-                if not self.start_virtual_camera():
+                if not await self.start_virtual_camera():
                     logger.warning("⚠️ Virtual camera might not be fully active, but proceeding with recording")
             
             # Clear any previous recording path
@@ -1077,20 +1727,20 @@ AuthRequired=false
             self.client.start_record()
             
             # Verify recording actually started
-            time.sleep(2)
-            status = self.client.get_record_status()
+            status = await self._poll_output(self.client.get_record_status, active=True, timeout=2.0)
             
             if status.output_active:
                 self.state = RecorderState.RECORDING
-                self._trigger_event('state_changed', self.state)
                 self._trigger_event('recording_started', self.recording_start_time)
                 
-                logger.info("✅ Recording STARTED with integrity monitoring")
-                logger.info(f"📊 OBS Recording Status: Active")
-                logger.info(f"📸 Virtual Camera: {'Active' if self.state == RecorderState.VIRTUAL_CAM_ACTIVE else 'Starting'}")
-                
-                if self.recording_target:
-                    logger.info(f"📁 Target: {self.recording_target['full_path']}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("✅ Recording STARTED with integrity monitoring")
+                    logger.info("📊 OBS Recording Status: Active")
+                    logger.info("📸 Virtual Camera: %s",
+                                'Active' if self.state == RecorderState.VIRTUAL_CAM_ACTIVE else 'Starting')
+                    
+                    if self.recording_target:
+                        logger.info("📁 Target: %s", self.recording_target['full_path'])
                 
                 return True, "Recording started"
             else:
@@ -1101,10 +1751,9 @@ AuthRequired=false
         except Exception as e:
             logger.error(f"❌ Failed to start recording: {e}")
             self.state = RecorderState.ERROR
-            self._trigger_event('state_changed', self.state)
             return False, str(e)
     
-    def stop_recording(self) -> Tuple[bool, str]:
+    async def stop_recording(self) -> Tuple[bool, str]:
         """
         Stop recording safely with integrity guarantees
         Returns (success, message_or_path)
@@ -1114,137 +1763,134 @@ AuthRequired=false
             return False, "Not recording"
         
         self.state = RecorderState.STOPPING
-        self._trigger_event('state_changed', self.state)
         
         try:
             logger.info("🛑 Stopping recording with safe shutdown...")
             
             # 1. Stop recording
-            self.client.stop_record()
+            response = self.client.stop_record()
+            output_path = getattr(response, 'output_path', None)
             
             # 2. Wait for OBS to finalize file (CRITICAL FIX)
-            success = self.integrity_manager.wait_for_recording_stop(timeout=30)
+            success = await self.integrity_manager.wait_for_recording_stop(timeout=30, output_path=output_path)
             
             if not success:
                 logger.error("❌ Recording stop verification failed")
                 self.state = RecorderState.ERROR
                 return False, "Recording stop verification failed"
             
-            # 3. Stop virtual camera (optional, but do it after file is safe)
+            # 3. Stop virtual camera (optional, but do it after file is safe) while the file checks run.
+            # The record directory is resolved first and handed over, so the file work never talks to OBS.
             try:
-                vcam_status = self.client.get_virtual_cam_status()
-                if vcam_status.output_active:
-                    logger.info("📷 Stopping virtual camera...")
-                    self.client.stop_virtual_cam()
-                    time.sleep(1)
+                record_dir = await self.integrity_manager.run_io(self._get_record_directory)
             except Exception as e:
-                logger.debug(f"Virtual camera stop warning: {e}")
-            
-            # 4. Find the recording file
-            recording_file = self._find_latest_recording_safe()
-            
-            if not recording_file:
-                logger.error("❌ Could not find recording file")
-                self.state = RecorderState.CONNECTED
-                return False, "No recording file found"
-            
-            # 5. Verify file integrity
-            is_valid, error = self.integrity_manager.verify_file_complete(recording_file)
-            
-            if not is_valid:
-                logger.error(f"❌ Recording file corrupted: {error}")
-                # Don't move corrupted files
-                self.last_recording_path = recording_file
-                self.state = RecorderState.CONNECTED
-                return False, f"Recording corrupted: {error}"
-            
-            # 6. Move to target location (if specified)
-            final_path = recording_file
-            if self.recording_target:
-                move_success, move_result = self._move_to_target_safe(recording_file)
-                
-                if move_success:
-                    final_path = move_result
-                else:
-                    logger.error(f"❌ Failed to move file: {move_result}")
-                    final_path = recording_file
-            
-            self.last_recording_path = final_path
-            
-            # 7. Final verification
-            if os.path.exists(final_path):
-                file_size_mb = os.path.getsize(final_path) / (1024 * 1024)
-                logger.info(f"✅ Recording saved: {os.path.basename(final_path)} ({file_size_mb:.1f} MB)")
-                
-                # Double-check integrity
-                is_valid, error = self.integrity_manager.verify_file_complete(final_path)
-                if not is_valid:
-                    logger.error(f"❌ FINAL VERIFICATION FAILED: {error}")
-                    self.state = RecorderState.ERROR
-                    return False, f"File corrupted after move: {error}"
-            else:
-                logger.error("❌ Final file does not exist")
-                self.state = RecorderState.ERROR
-                return False, "Final file missing"
-            
-            # Success
-            self.state = RecorderState.CONNECTED
-            self._trigger_event('state_changed', self.state)
-            self._trigger_event('recording_stopped', final_path)
-            self.recording_target = None
-            
-            return True, final_path
+                logger.error(f"❌ Could not get OBS record directory: {e}")
+                record_dir = None
+            vcam_stop = asyncio.create_task(self._stop_virtual_camera())
+            try:
+                return await self._finalize_recording(record_dir)
+            finally:
+                with contextlib.suppress(Exception):
+                    await asyncio.wait_for(vcam_stop, timeout=5)
             
         except Exception as e:
             logger.error(f"❌ Error stopping recording: {e}")
             self.state = RecorderState.ERROR
-            self._trigger_event('state_changed', self.state)
             return False, str(e)
     
-    def _find_latest_recording_safe(self) -> Optional[str]:
+    async def _stop_virtual_camera(self):
+        """Stop the virtual camera if it is running; failures are only logged"""
+        try:
+            vcam_status = self.client.get_virtual_cam_status()
+            if vcam_status.output_active:
+                logger.info("📷 Stopping virtual camera...")
+                self.client.stop_virtual_cam()
+                await self._poll_output(self.client.get_virtual_cam_status, active=False, timeout=1.0)
+        except Exception as e:
+            logger.debug(f"Virtual camera stop warning: {e}")
+    
+    async def _finalize_recording(self, record_dir: Optional[str]) -> Tuple[bool, str]:
+        """Find, verify and move the stopped recording. Returns (success, message_or_path)"""
+        # 4. Find the recording file
+        recording_file = await self.integrity_manager.run_io(self._find_latest_recording_safe, record_dir)
+        
+        if not recording_file:
+            logger.error("❌ Could not find recording file")
+            self.state = RecorderState.CONNECTED
+            return False, "No recording file found"
+        
+        # 5. Verify file integrity
+        is_valid, error = await self.integrity_manager.verify_file_complete_async(recording_file)
+        
+        if not is_valid:
+            logger.error(f"❌ Recording file corrupted: {error}")
+            # Don't move corrupted files
+            self.last_recording_path = recording_file
+            self.state = RecorderState.CONNECTED
+            return False, f"Recording corrupted: {error}"
+        
+        # 6. Move to target location (if specified)
+        final_path = recording_file
+        moved = False
+        if self.recording_target:
+            move_success, move_result = await self.integrity_manager.run_io(
+                self._move_to_target_safe, recording_file
+            )
+        
+            if move_success:
+                final_path = move_result
+                moved = True
+            else:
+                logger.error(f"❌ Failed to move file: {move_result}")
+                final_path = recording_file
+        
+        self.last_recording_path = final_path
+        
+        # 7. Final verification
+        try:
+            st = os.stat(final_path)
+        except FileNotFoundError:
+            logger.error("❌ Final file does not exist")
+            self.state = RecorderState.ERROR
+            return False, "Final file missing"
+        
+        file_size_mb = st.st_size / (1024 * 1024)
+        logger.info(f"✅ Recording saved: {os.path.basename(final_path)} ({file_size_mb:.1f} MB)")
+        
+        # Double-check integrity after a move; an unmoved file was verified in step 5
+        if moved:
+            is_valid, error = await self.integrity_manager.verify_file_complete_async(final_path)
+        if not is_valid:
+            logger.error(f"❌ FINAL VERIFICATION FAILED: {error}")
+            self.state = RecorderState.ERROR
+            return False, f"File corrupted after move: {error}"
+        
+        # Success
+        self.state = RecorderState.CONNECTED
+        self._trigger_event('recording_stopped', final_path)
+        self.recording_target = None
+        
+        return True, final_path
+    
+    def _find_latest_recording_safe(self, record_dir: Optional[str]) -> Optional[str]:
         """
-        Find the latest recording file with multiple safety checks
+        Find the latest recording file in an already-resolved record directory (no OBS requests)
         """
         try:
-            response = self.client.get_record_directory()
-            record_dir = response.record_directory
-            
-            if not os.path.exists(record_dir):
+            if not record_dir or not os.path.exists(record_dir):
                 logger.error(f"❌ Recording directory not found: {record_dir}")
                 return None
             
-            # Use integrity manager to find stable file
+            # Use integrity manager to find stable file, falling back to any recent video file
             file_path = self.integrity_manager.find_stable_recording_file(
                 record_dir, 
-                self.recording_start_time
+                self.recording_start_time,
+                fallback_slack=5
             )
             
             if file_path:
                 logger.info(f"📄 Found recording: {os.path.basename(file_path)}")
-                return file_path
-            else:
-                # Fallback: look for any recent video file
-                video_patterns = ['*.mp4', '*.mkv', '*.mov', '*.flv', '*.avi']
-                latest_file = None
-                latest_mtime = 0
-                
-                for pattern in video_patterns:
-                    for file_path in glob.glob(os.path.join(record_dir, pattern)):
-                        try:
-                            mtime = os.path.getmtime(file_path)
-                            # Only consider files created after recording start
-                            if mtime > self.recording_start_time - 5:
-                                if mtime > latest_mtime:
-                                    latest_mtime = mtime
-                                    latest_file = file_path
-                        except:
-                            continue
-                
-                if latest_file:
-                    logger.warning(f"⚠️ Using fallback file detection: {os.path.basename(latest_file)}")
-                    return latest_file
-            
-            return None
+            return file_path
             
         except Exception as e:
             logger.error(f"❌ Failed to find recording: {e}")
@@ -1261,7 +1907,7 @@ AuthRequired=false
         
         # Handle filename conflicts
         if os.path.exists(target_path):
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             base, ext = os.path.splitext(self.recording_target['filename'])
             new_filename = f"{base}_{timestamp}{ext}"
             target_path = os.path.join(self.recording_target['folder'], new_filename)
@@ -1280,13 +1926,14 @@ AuthRequired=false
     def set_recording_target(self, folder_path, filename):
         """Set where to save the recording"""
         try:
-            os.makedirs(folder_path, exist_ok=True)
+            if folder_path not in self._known_dirs:
+                os.makedirs(folder_path, exist_ok=True)
+                self._known_dirs.add(folder_path)
             
             if not filename.lower().endswith('.mp4'):
                 filename += CONFIG['recording_save_extension']
             
-            import re
-            filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+            filename = _INVALID_FN_RE.sub('_', filename)
             
             self.recording_target = {
                 'folder': folder_path,
@@ -1301,19 +1948,19 @@ AuthRequired=false
             logger.error(f"❌ Failed to set recording target: {e}")
             return False
     
-    def disconnect(self):
+    async def disconnect(self):
         """Disconnect from OBS with proper shutdown for OBS 32"""
         try:
             if self.state == RecorderState.RECORDING:
-                self.stop_recording()
+                await self.stop_recording()
             
             if self.client:
                 try:
                     # Save settings before disconnecting
                     self.client.save()
                     logger.info("💾 OBS settings saved")
-                except:
-                    pass
+                except Exception as e:
+                    logger.debug(f"Settings save warning: {e}")
             
             # Use the new graceful shutdown method if we started OBS
             if self.obs_started_by_us and self.obs_process:
@@ -1325,32 +1972,44 @@ AuthRequired=false
                         if self.client:
                             try:
                                 self.client.send("Quit")
-                                time.sleep(5)
-                            except:
-                                pass
+                                await asyncio.get_running_loop().run_in_executor(
+                                    None, self._wait_for_process_exit, self.obs_process, 5.0
+                                )
+                            except Exception as e:
+                                logger.debug(f"Quit request warning: {e}")
                         
-                        # Last resort, but should rarely be needed
-                        if self._is_obs_running():
+                        # Last resort, but should rarely be needed (poll is a waitpid on our own child)
+                        if self.obs_process.poll() is None:
                             logger.warning("⚠️ OBS still running, forcing termination...")
                             self.obs_process.terminate()
-                            self.obs_process.wait(timeout=10)
+                            await asyncio.get_running_loop().run_in_executor(
+                                None, self._wait_for_process_exit, self.obs_process, 10.0
+                            )
                     except Exception as e:
                         logger.error(f"⚠️ Error in fallback shutdown: {e}")
             
             elif self._is_obs_running():
                 logger.info("ℹ️ OBS still running (was started externally)")
             
+            self._invalidate_obs_running()
+            
+            if self.event_client:
+                try:
+                    self.event_client.disconnect()
+                except Exception as e:
+                    logger.debug(f"Event client disconnect warning: {e}")
+                self.set_obs_client(None)
+            
             if self.client:
                 self.client = None
+            self._record_dir_cache = None
             
             self.state = RecorderState.DISCONNECTED
-            self._trigger_event('state_changed', self.state)
             logger.info("✅ Disconnected")
             
         except Exception as e:
             logger.error(f"⚠️ Error during disconnect: {e}")
             self.state = RecorderState.DISCONNECTED
-            self._trigger_event('state_changed', self.state)
     
     def get_status(self):
         """Get current status"""
@@ -1358,8 +2017,10 @@ AuthRequired=false
             return f"State: {self.state}"
         
         try:
-            record_status = self.client.get_record_status()
-            virtual_cam_status = self.client.get_virtual_cam_status()
+            record_status, virtual_cam_status = self._request_batch('GetRecordStatus', 'GetVirtualCamStatus')
+            for result in (record_status, virtual_cam_status):
+                if isinstance(result, Exception):
+                    raise result
             
             status_text = f"State: {self.state}\n"
             status_text += f"Recording: {'ACTIVE' if record_status.output_active else 'INACTIVE'}\n"
@@ -1377,62 +2038,75 @@ AuthRequired=false
 # ============================================================================
 # CONFIGURATION MANAGEMENT CLASS
 # ============================================================================
+_BASE_DIR = Path(__file__).resolve().parent
+
+
+def _require_env(name: str) -> str:
+    value = os.getenv(name)
+    if not value:
+        raise ValueError(f"{name} environment variable is required")
+    return value
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env_cached() -> MappingProxyType:
+    """Read and parse the environment once per process; Config instances share the result"""
+    return MappingProxyType({
+        # LLM Configuration - NO FALLBACKS, only from .env
+        'LLM_API_KEY': _require_env("LLM_API_KEY"),
+        'LLM_MODEL': _require_env("LLM_MODEL"),
+        'LLM_BASE_URL': _require_env("LLM_BASE_URL"),
+        'LLM_TEMPERATURE': float(os.getenv("LLM_TEMPERATURE", "0.2")),
+        'LLM_MAX_TOKENS': int(os.getenv("LLM_MAX_TOKENS", "4000")),
+        'LLM_TIMEOUT': int(os.getenv("LLM_TIMEOUT", "60")),
+
+        # Email Configuration - NO FALLBACKS for required fields
+        'EMAIL_SENDER': _require_env("EMAIL_SENDER"),
+        'EMAIL_PASSWORD': _require_env("EMAIL_PASSWORD"),
+        'EMAIL_SMTP_SERVER': os.getenv("EMAIL_SMTP_SERVER", "smtp.gmail.com"),
+        'EMAIL_SMTP_PORT': int(os.getenv("EMAIL_SMTP_PORT", "587")),
+        'EMAIL_USE_TLS': os.getenv("EMAIL_USE_TLS", "true").lower() == "true",
+        'EMAIL_DEFAULT_SUBJECT': os.getenv("EMAIL_DEFAULT_SUBJECT", "Meeting Summary - {meeting_id}"),
+        'EMAIL_DEFAULT_BODY': os.getenv("EMAIL_DEFAULT_BODY", "Please find the meeting files attached.\n\nMeeting ID: {meeting_id}\nDate: {date}\n\nBest regards,\nMeetingSense System"),
+
+        # Diarization Settings
+        'MAX_SPEAKERS': int(os.getenv("MAX_SPEAKERS", "8")),
+        'COMPILE_ECAPA': os.getenv("COMPILE_ECAPA", "true").lower() == "true",
+        'WHISPER_QUANT': os.getenv("WHISPER_QUANT", "int8").lower(),  # none | int8 | int4
+        'USE_ONNX': os.getenv("USE_ONNX", "false").lower() == "true",
+        'WHISPER_ONNX_DIR': os.getenv("WHISPER_ONNX_DIR", str(_BASE_DIR / "models" / "whisper-onnx-int8")),
+
+        # Recording Settings
+        # Opt-in: check in-kernel copies by size and sampled blocks instead of a full CRC of both files
+        'SAMPLED_COPY_VERIFY': os.getenv("SAMPLED_COPY_VERIFY", "false").lower() == "true",
+
+        # Application Settings
+        'PORT': int(os.getenv("PORT", "8000")),
+        'HOST': os.getenv("HOST", "0.0.0.0"),
+        'DEBUG': os.getenv("DEBUG", "false").lower() == "true",
+    })
+
+
 class Config:
     def __init__(self):
         self.SIMILARITY_THRESHOLD = 0.4
-        self.BASE_DIR = Path(__file__).parent
+        self.BASE_DIR = _BASE_DIR
         self.KNOWN_FACES_DIR = self.BASE_DIR / "KnownFaces"
         self.AUDIO_SAMPLES_DIR = self.BASE_DIR / "voice_samples"
         self.MEETINGS_DATA_DIR = self.BASE_DIR / "MeetingsData"
         self.STATIC_DIR = self.BASE_DIR / "static"
         
         # Model configurations
+        # Providers are chosen at model load so torch isn't imported at startup
         self.FACE_MODEL_CONFIG = {
             'allowed_modules': ['detection', 'recognition'],
-            'providers': ['CUDAExecutionProvider', 'CPUExecutionProvider'] 
-            if torch.cuda.is_available() else ['CPUExecutionProvider']
         }
         
         # Load from environment
         self.load_env()
     
     def load_env(self):
-        # LLM Configuration - NO FALLBACKS, only from .env
-        self.LLM_API_KEY = os.getenv("LLM_API_KEY")
-        if not self.LLM_API_KEY:
-            raise ValueError("LLM_API_KEY environment variable is required")
-        
-        self.LLM_MODEL = os.getenv("LLM_MODEL")
-        if not self.LLM_MODEL:
-            raise ValueError("LLM_MODEL environment variable is required")
-        
-        self.LLM_BASE_URL = os.getenv("LLM_BASE_URL")
-        if not self.LLM_BASE_URL:
-            raise ValueError("LLM_BASE_URL environment variable is required")
-        
-        self.LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.2"))
-        self.LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "4000"))
-        self.LLM_TIMEOUT = int(os.getenv("LLM_TIMEOUT", "60"))
-
-        # Email Configuration - NO FALLBACKS for required fields  
-        self.EMAIL_SENDER = os.getenv("EMAIL_SENDER")
-        if not self.EMAIL_SENDER:
-            raise ValueError("EMAIL_SENDER environment variable is required")
-        
-        self.EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
-        if not self.EMAIL_PASSWORD:
-            raise ValueError("EMAIL_PASSWORD environment variable is required")
-        
-        self.EMAIL_SMTP_SERVER = os.getenv("EMAIL_SMTP_SERVER", "smtp.gmail.com")
-        self.EMAIL_SMTP_PORT = int(os.getenv("EMAIL_SMTP_PORT", "587"))
-        self.EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "true").lower() == "true"
-        self.EMAIL_DEFAULT_SUBJECT = os.getenv("EMAIL_DEFAULT_SUBJECT", "Meeting Summary - {meeting_id}")
-        self.EMAIL_DEFAULT_BODY = os.getenv("EMAIL_DEFAULT_BODY", "Please find the meeting files attached.\n\nMeeting ID: {meeting_id}\nDate: {date}\n\nBest regards,\nMeetingSense System")
-
-        # Application Settings
-        self.PORT = int(os.getenv("PORT", "8000"))
-        self.HOST = os.getenv("HOST", "0.0.0.0")
-        self.DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+        self.__dict__.update(_load_env_cached())
 
 # Create global config instance
 config = Config()
@@ -1452,7 +2126,11 @@ os.makedirs(AUDIO_SAMPLES_DIR, exist_ok=True)
 os.makedirs(MEETINGS_DATA_DIR, exist_ok=True)
 os.makedirs(STATIC_DIR, exist_ok=True)
 
-app = FastAPI(title="Smart Meeting Manager - Audio and Attendance System", version="13.0.0")
+app = FastAPI(
+    title="Smart Meeting Manager - Audio and Attendance System",
+    version="13.0.0",
+    default_response_class=ORJSONResponse
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1501,23 +2179,80 @@ def clean_meeting_title_for_display(original_title):
     
     return title if title else "Meeting Discussion"
 
+# MP4-family containers often keep the moov atom at the end, which ffmpeg can't reach over a pipe
+_SEEKABLE_ONLY_SUFFIXES = frozenset({'.mp4', '.m4a', '.m4v', '.mov', '.3gp', '.3g2'})
+
+def decode_audio_ffmpeg(audio_path, sample_rate=16000, suffix=''):
+    """
+    Decode any container ffmpeg understands straight to mono float32 samples (path or raw bytes).
+    Raw bytes go over stdin, falling back to a temp file for MP4-family suffixes or a failed pipe decode.
+    """
+    def run(source, data=None):
+        result = subprocess.run(
+            ["ffmpeg", "-v", "error", "-i", source,
+             "-f", "f32le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+            input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+        )
+        return np.frombuffer(result.stdout, dtype=np.float32)
+    
+    if not isinstance(audio_path, (bytes, bytearray, memoryview)):
+        return run(audio_path)
+    
+    suffix = suffix.lower()
+    if suffix not in _SEEKABLE_ONLY_SUFFIXES:
+        try:
+            return run("pipe:0", audio_path)
+        except subprocess.CalledProcessError as e:
+            logger.debug(f"ffmpeg pipe decode failed, retrying from a temp file: {e.stderr[-200:]!r}")
+    
+    # delete=False so ffmpeg can open the file on Windows too
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        tmp.write(audio_path)
+    try:
+        return run(tmp.name)
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(tmp.name)
+
+def resample_audio(audio_data, orig_sr, target_sr):
+    """Polyphase resample of a mono signal"""
+    from math import gcd
+    import scipy.signal as signal
+    if orig_sr == target_sr:
+        return audio_data
+    g = gcd(int(orig_sr), int(target_sr))
+    return signal.resample_poly(audio_data, target_sr // g, orig_sr // g).astype(np.float32)
+
+@functools.lru_cache(maxsize=32)
+def _design_sos(order, cutoff, sr, btype):
+    """
+    Butterworth SOS coefficients, designed once per (order, cutoff Hz, sample rate, type).
+    float32 so sosfilt runs its single-precision kernel on float32 audio instead of upcasting.
+    """
+    import scipy.signal as signal
+    return signal.butter(order, cutoff, btype=btype, fs=sr, output='sos').astype(np.float32)
+
 def validate_and_convert_audio(audio_content, filename, target_sample_rate=16000):
+    """audio_content is raw bytes or a seekable binary file object (e.g. UploadFile.file)"""
+    import scipy.signal as signal
     try:
-        temp_path = f"temp_{uuid.uuid4().hex}{Path(filename).suffix}"
-        with open(temp_path, "wb") as f:
-            f.write(audio_content)
-        
+        # Decode straight from the upload; no temp file round trip and no extra bytes copy
+        source = io.BytesIO(audio_content) if isinstance(audio_content, (bytes, bytearray)) else audio_content
         try:
-            audio_data, sr = sf.read(temp_path)
-        except:
+            audio_data, sr = sf.read(source, dtype='float32', always_2d=False)
+        except Exception:
             try:
-                audio_data, sr = librosa.load(temp_path, sr=target_sample_rate)
-            except:
-                try:
-                    waveform, sr = torchaudio.load(temp_path)
-                    audio_data = waveform.numpy().flatten()
-                except Exception as e:
-                    raise Exception(f"Failed to load audio file: {e}")
+                # Only unusual containers take this path
+                source.seek(0)
+                audio_data = decode_audio_ffmpeg(
+                    source.read(), target_sample_rate, suffix=os.path.splitext(filename or '')[1]
+                )
+                sr = target_sample_rate
+            except Exception as e:
+                raise Exception(f"Failed to load audio file: {e}")
+        
+        if audio_data.ndim > 1:
+            audio_data = np.mean(audio_data, axis=1)
         
         if audio_data is None or len(audio_data) == 0:
             raise Exception("Empty audio data")
@@ -1528,110 +2263,112 @@ def validate_and_convert_audio(audio_content, filename, target_sample_rate=16000
         if duration > 30.0:
             raise Exception(f"Audio too long ({duration:.1f}s). Maximum 30 seconds allowed.")
         
+        # Resampling and filtering are linear, so the peak gain is folded into the final int16 scale
         max_val = np.max(np.abs(audio_data))
-        if max_val > 0:
-            audio_data = audio_data / max_val * 0.8
+        gain = 0.8 / max_val if max_val > 0 else 1.0
         
         if sr != target_sample_rate:
-            audio_data = librosa.resample(audio_data, orig_sr=sr, target_sr=target_sample_rate)
+            audio_data = resample_audio(audio_data, sr, target_sample_rate)
             sr = target_sample_rate
         
         nyquist = sr / 2
         high_pass_freq = 80
         if high_pass_freq < nyquist:
-            sos = signal.butter(4, high_pass_freq/nyquist, 'highpass', output='sos')
-            audio_data = signal.sosfilt(sos, audio_data)
-        
-        if len(audio_data.shape) > 1:
-            audio_data = np.mean(audio_data, axis=0)
-        
-        audio_data_int16 = (audio_data * 32767).astype(np.int16)
+            audio_data = signal.sosfilt(_design_sos(4, high_pass_freq, sr, 'highpass'),
+                                        audio_data.astype(np.float32, copy=False))
         
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+        audio_data_int16 = np.empty(audio_data.shape, dtype=np.int16)
+        np.multiply(audio_data, gain * 32767, out=audio_data_int16, casting='unsafe')
         
         return True, audio_data_int16, sr, None
         
     except (FileNotFoundError, PermissionError) as e:
-        if 'temp_path' in locals() and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except:
-                pass
         return False, None, None, f"File error: {str(e)}"
     except (IOError, OSError) as e:
-        if 'temp_path' in locals() and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except:
-                pass
         return False, None, None, f"IO error: {str(e)}"
     except Exception as e:
-        if 'temp_path' in locals() and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except:
-                pass
         return False, None, None, f"Unexpected error: {str(e)}"
 
 class EnhancedAudioDiarizer:
+    WHISPER_MODEL_ID = "openai/whisper-large-v3"
+    WHISPER_GENERATE_KWARGS = {
+        "task": "transcribe",
+        "language": "en",
+        "no_repeat_ngram_size": 3,
+        "repetition_penalty": 1.2,
+    }
+    EIGENGAP_MIN_SEGMENTS = 8  # below this the silhouette sweep is cheap and more reliable
+    SILENCE_RMS = 1e-4  # transcription segments quieter than this skip filtering and Whisper entirely
+    SPEAKER_WINDOW_S = 2.0  # speaker-ID window length; the compiled ECAPA graph is warmed on it
+    ECAPA_BATCH_SIZE = 32
+    MODEL_WARMUP_TIMEOUT = 600  # seconds diarize_audio waits on the startup warmup
+    
     def __init__(self):
         self.speaker_model = None
         self.whisper_model = None
         self.voice_embeddings = {}
+        self.voice_names = []
+        self.voice_matrix = None  # rows are the (unit-norm) voice_embeddings values
         self.models_initialized = False
+        self._init_lock = threading.Lock()
+        self._init_future = None
         self.current_progress = 0
         self.progress_message = ""
         
+    def start_background_init(self):
+        """Load the diarization models on a worker thread so startup is not blocked"""
+        if self._init_future is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarizer-warmup")
+            self._init_future = executor.submit(self._initialize_models)
+            executor.shutdown(wait=False)
+        return self._init_future
+    
+    def _wait_for_models(self, timeout=None):
+        """Block until a background warmup (if any) finishes; models load lazily otherwise"""
+        if self._init_future is None or self._init_future.done():
+            return
+        logger.info("⏳ Waiting for background model warmup to finish...")
+        try:
+            self._init_future.result(timeout=timeout or self.MODEL_WARMUP_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"⚠️ Background model warmup did not complete: {e}")
+    
     def _initialize_models(self):
+        from speechbrain.inference import SpeakerRecognition
         if self.models_initialized:
             return
-            
-        try:
-            logger.info("Loading diarization models...")
-            
-            self.speaker_model = SpeakerRecognition.from_hparams(
-                source="speechbrain/spkrec-ecapa-voxceleb",
-                savedir="pretrained_ecapa"
-            )
-            
+        with self._init_lock:
+            if self.models_initialized:
+                return
             try:
-                if torch.cuda.is_available():
-                    device = 0
-                    torch_dtype = torch.float16
-                else:
-                    device = -1
-                    torch_dtype = torch.float32
+                logger.info("Loading diarization models...")
+                
+                self.speaker_model = self._compile_speaker_model(SpeakerRecognition.from_hparams(
+                    source="speechbrain/spkrec-ecapa-voxceleb",
+                    savedir="pretrained_ecapa"
+                ))
                 
-                self.whisper_model = pipeline(
-                    "automatic-speech-recognition",
-                    model="openai/whisper-large-v3",
-                    device=device,
-                    torch_dtype=torch_dtype,
-                    chunk_length_s=30,
-                    batch_size=4,
-                )
-                logger.info("✅ Whisper large-v3 model loaded")
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to load large-v3: {e}")
                 try:
-                    self.whisper_model = pipeline(
-                        "automatic-speech-recognition",
-                        model="openai/whisper-large-v3",
-                        device=device,
-                        torch_dtype=torch_dtype,
-                    )
-                    logger.info("✅ Whisper medium model loaded (fallback)")
-                except Exception as e2:
-                    logger.error(f"❌ Failed to load any Whisper model: {e2}")
-                    self.whisper_model = None
-            
-            self.models_initialized = True
-            logger.info("✅ Diarization models loaded successfully")
-        except Exception as e:
-            logger.error(f"❌ Failed to load diarization models: {e}")
+                    self.whisper_model = self._build_whisper_pipeline(chunk_length_s=30, batch_size=4)
+                    logger.info("✅ Whisper large-v3 model loaded")
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to load large-v3: {e}")
+                    try:
+                        self.whisper_model = self._build_whisper_pipeline()
+                        logger.info("✅ Whisper medium model loaded (fallback)")
+                    except Exception as e2:
+                        logger.error(f"❌ Failed to load any Whisper model: {e2}")
+                        self.whisper_model = None
+                
+                self.models_initialized = True
+                logger.info("✅ Diarization models loaded successfully")
+            except Exception as e:
+                logger.error(f"❌ Failed to load diarization models: {e}")
     
     def preprocess_audio_for_speaker_id(self, waveform, sr, target_sr=16000):
+        import torch
+        import torchaudio
+        import scipy.signal as signal
         if waveform.dim() > 1 and waveform.shape[0] > 1:
             waveform = waveform.mean(dim=0, keepdim=True)
         
@@ -1639,39 +2376,62 @@ class EnhancedAudioDiarizer:
             waveform = torchaudio.functional.resample(waveform, sr, target_sr)
             sr = target_sr
         
-        audio_np = waveform.squeeze().numpy()
+        audio_np = waveform.squeeze().numpy().astype(np.float32, copy=False)
         
-        sos = signal.butter(4, 80, 'hp', fs=sr, output='sos')
-        audio_np = signal.sosfilt(sos, audio_np)
+        audio_np = signal.sosfilt(_design_sos(4, 80, sr, 'highpass'), audio_np)
         
-        rms = np.sqrt(np.mean(audio_np**2))
+        # sosfilt returned a fresh float32 array, so scale and clip it in place
+        rms = np.sqrt(np.mean(np.square(audio_np)))
         if rms > 0:
-            audio_np = audio_np / rms * 0.1
+            audio_np *= np.float32(0.1 / rms)
         
-        audio_np = np.clip(audio_np, -1.0, 1.0)
+        np.clip(audio_np, -1.0, 1.0, out=audio_np)
         
-        return torch.tensor(audio_np).unsqueeze(0), sr
+        return torch.from_numpy(audio_np).unsqueeze(0), sr
     
     def preprocess_audio_simple(self, audio_np, sr):
+        import scipy.signal as signal
+        audio_np = np.asarray(audio_np, dtype=np.float32)
+        # Cheap energy gate on a decimated view: silent gaps skip the filter and inference entirely
+        if np.sqrt(np.mean(np.square(audio_np[::8]))) < self.SILENCE_RMS:
+            return None
+        
         nyquist = sr / 2
-        low_cutoff = 80 / nyquist
-        high_cutoff = min(8000 / nyquist, 0.95)
+        high_cutoff = min(8000, 0.95 * nyquist)
         
         try:
-            sos = signal.butter(4, [low_cutoff, high_cutoff], btype='band', output='sos')
-            audio_np = signal.sosfilt(sos, audio_np)
+            audio_np = signal.sosfilt(_design_sos(4, (80, high_cutoff), sr, 'bandpass'), audio_np)
         except Exception as e:
             logger.warning(f"    ⚠️ Band-pass filter failed: {e}")
+            audio_np = audio_np.copy()
         
-        rms = np.sqrt(np.mean(audio_np**2))
+        # audio_np is a private buffer from here on, so normalize and clip in place
+        rms = np.sqrt(np.mean(np.square(audio_np)))
         if rms > 1e-6:
             target_rms = 0.05
-            audio_np = audio_np * (target_rms / rms)
+            audio_np *= np.float32(target_rms / rms)
         
-        audio_np = np.clip(audio_np, -0.99, 0.99)
+        np.clip(audio_np, -0.99, 0.99, out=audio_np)
         
         return audio_np
     
+    @staticmethod
+    def _repeat_cut(words):
+        """
+        Index to truncate words at when a run of n >= 3 words is immediately repeated, else None.
+        The longest repeated run wins (first occurrence for that length). Words are mapped to
+        integer ids and every offset for a given n is compared at once on sliding windows.
+        """
+        from numpy.lib.stride_tricks import sliding_window_view
+        vocab = {}
+        ids = np.fromiter((vocab.setdefault(w, len(vocab)) for w in words), dtype=np.int32, count=len(words))
+        for n in range(len(ids) // 2, 2, -1):
+            windows = sliding_window_view(ids, n)
+            matches = np.flatnonzero((windows[:-n] == windows[n:]).all(axis=1))
+            if matches.size:
+                return int(matches[0]) + n
+        return None
+    
     @staticmethod
     def remove_repeated_words(text):
         if not text or len(text) < 10:
@@ -1699,13 +2459,9 @@ class EnhancedAudioDiarizer:
             
             sentence_words = sentence.split()
             if len(sentence_words) > 10:
-                for i in range(3, len(sentence_words) // 2 + 1):
-                    for j in range(len(sentence_words) - i * 2 + 1):
-                        segment1 = ' '.join(sentence_words[j:j+i])
-                        segment2 = ' '.join(sentence_words[j+i:j+i*2])
-                        if segment1 == segment2:
-                            sentence = ' '.join(sentence_words[:j+i])
-                            break
+                cut = EnhancedAudioDiarizer._repeat_cut(sentence_words)
+                if cut is not None:
+                    sentence = ' '.join(sentence_words[:cut])
             
             deduplicated.append(sentence)
             last_sentence = sentence
@@ -1719,25 +2475,78 @@ class EnhancedAudioDiarizer:
     def convert_to_wav(self, audio_path):
         if not audio_path.endswith(".wav"):
             logger.info("Converting input to WAV …")
-            sound = AudioSegment.from_file(audio_path)
             wav_path = os.path.splitext(audio_path)[0] + ".wav"
-            sound = sound.set_channels(1).set_frame_rate(16000)
-            sound.export(wav_path, format="wav")
+            # Single ffmpeg pass: decode, downmix and resample straight to 16kHz mono WAV
+            subprocess.run(
+                ["ffmpeg", "-y", "-v", "error", "-i", audio_path, "-ac", "1", "-ar", "16000", wav_path],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True
+            )
             return wav_path
         return audio_path
     
     def load_embedding_model(self):
+        from speechbrain.inference import SpeakerRecognition
         if self.speaker_model is not None:
             return self.speaker_model
             
         logger.info("Loading embedding model …")
-        self.speaker_model = SpeakerRecognition.from_hparams(
+        self.speaker_model = self._compile_speaker_model(SpeakerRecognition.from_hparams(
             source="speechbrain/spkrec-ecapa-voxceleb",
             savedir="pretrained_ecapa"
-        )
+        ))
         return self.speaker_model
     
+    def _compile_speaker_model(self, model):
+        """
+        torch.compile the ECAPA embedding module and warm it up on the diarization window shape.
+        Falls back to eager if compilation is disabled, unsupported here, or fails on warmup.
+        """
+        import torch
+        if not config.COMPILE_ECAPA or _IS_WIN or not hasattr(torch, "compile"):
+            return model
+        
+        eager = model.mods.embedding_model
+        cuda = str(getattr(model, 'device', 'cpu')).startswith('cuda')
+        try:
+            model.mods.embedding_model = torch.compile(eager, mode="reduce-overhead" if cuda else "default")
+            warmup = torch.zeros(self.ECAPA_BATCH_SIZE, int(self.SPEAKER_WINDOW_S * 16000))
+            self._encode_segments(model, warmup, self.ECAPA_BATCH_SIZE)
+            model.compiled_encoder = True
+            model.compiled_window = warmup.shape[1]
+            logger.info("✅ ECAPA encoder compiled")
+        except Exception as e:
+            model.mods.embedding_model = eager
+            logger.warning(f"⚠️ torch.compile unavailable for ECAPA, running eager: {e}")
+        return model
+    
+    def _load_voice_sample(self, model, sample_path, encode_lock):
+        """Averaged ECAPA embedding for one voice sample file, or None if it is too short"""
+        import torch
+        import torchaudio
+        wav_path = self.convert_to_wav(sample_path)
+        
+        waveform, sr = torchaudio.load(wav_path)
+        
+        waveform, sr = self.preprocess_audio_for_speaker_id(waveform, sr)
+        
+        chunk_duration = 3.0
+        chunk_samples = int(chunk_duration * sr)
+        total_samples = waveform.shape[1]
+        
+        chunks = [
+            waveform[:, start_idx:start_idx + chunk_samples]
+            for start_idx in range(0, total_samples - chunk_samples, chunk_samples // 2)
+        ]
+        if not chunks:
+            return None, 0
+        
+        # Decoding runs in parallel; one GPU submission per file, serialized across workers
+        with encode_lock:
+            embeddings_list = self._encode_segments(model, torch.cat(chunks, dim=0))
+        return np.mean(embeddings_list, axis=0), len(embeddings_list)
+    
     def load_voice_samples(self, model, samples_dir="voice_samples"):
+        import torch
         logger.info(f"\n📁 Loading voice samples from '{samples_dir}/' …")
         
         if not os.path.exists(samples_dir):
@@ -1745,110 +2554,206 @@ class EnhancedAudioDiarizer:
             return {}
         
         voice_embeddings = {}
-        
-        for filename in os.listdir(samples_dir):
-            if filename.lower().endswith(('.mp3', '.wav', '.m4a', '.flac')):
-                speaker_name = os.path.splitext(filename)[0]
-                sample_path = os.path.join(samples_dir, filename)
-                
-                wav_path = self.convert_to_wav(sample_path)
-                
+        filenames = [
+            filename for filename in os.listdir(samples_dir)
+            if filename.lower().endswith(('.mp3', '.wav', '.m4a', '.flac'))
+        ]
+        if filenames:
+            # CUDA and compiled graphs (CUDA graphs / dynamo caches) are not safe to drive from several threads
+            shared = torch.cuda.is_available() or getattr(model, 'compiled_encoder', False)
+            encode_lock = threading.Lock() if shared else contextlib.nullcontext()
+            
+            def process(filename):
                 try:
-                    waveform, sr = torchaudio.load(wav_path)
-                    
-                    waveform, sr = self.preprocess_audio_for_speaker_id(waveform, sr)
-                    
-                    chunk_duration = 3.0
-                    chunk_samples = int(chunk_duration * sr)
-                    total_samples = waveform.shape[1]
-                    
-                    embeddings_list = []
-                    
-                    for start_idx in range(0, total_samples - chunk_samples, chunk_samples // 2):
-                        end_idx = start_idx + chunk_samples
-                        chunk = waveform[:, start_idx:end_idx]
-                        
-                        with torch.no_grad():
-                            emb = model.encode_batch(chunk).squeeze().cpu().numpy()
-                            embeddings_list.append(emb)
-                    
-                    if embeddings_list:
-                        avg_embedding = np.mean(embeddings_list, axis=0)
-                        voice_embeddings[speaker_name] = avg_embedding
-                        logger.info(f"  ✅ Loaded: {speaker_name} ({len(embeddings_list)} chunks averaged)")
-                    else:
-                        logger.info(f"  ⚠️ {speaker_name}: audio too short")
-                        
+                    return self._load_voice_sample(model, os.path.join(samples_dir, filename), encode_lock)
                 except Exception as e:
                     logger.error(f"  ❌ Failed to load {filename}: {e}")
+                    return None
+            
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1, len(filenames)),
+                                    thread_name_prefix="voice-sample") as executor:
+                # map keeps directory order, so speaker order is the same as a serial load
+                for filename, loaded in zip(filenames, executor.map(process, filenames)):
+                    if loaded is None:
+                        continue
+                    speaker_name = os.path.splitext(filename)[0]
+                    embedding, n_chunks = loaded
+                    if embedding is not None:
+                        # Stored unit-norm so scoring is a plain dot product
+                        voice_embeddings[speaker_name] = embedding / (np.linalg.norm(embedding) + 1e-8)
+                        logger.info(f"  ✅ Loaded: {speaker_name} ({n_chunks} chunks averaged)")
+                    else:
+                        logger.info(f"  ⚠️ {speaker_name}: audio too short")
         
         logger.info(f"\n📊 Total voice samples loaded: {len(voice_embeddings)}")
+        self.voice_embeddings = voice_embeddings
+        self.voice_names, self.voice_matrix = self._voice_matrix(voice_embeddings)
         return voice_embeddings
     
+    @staticmethod
+    def _voice_matrix(voice_embeddings):
+        """(names, (S, D) float32 matrix) of the already unit-norm voice embeddings"""
+        if not voice_embeddings:
+            return [], None
+        matrix = np.stack(list(voice_embeddings.values())).astype(np.float32)
+        return list(voice_embeddings), matrix
+    
     def identify_speaker(self, segment_embedding, voice_embeddings, model, min_threshold=0.0):
         if not voice_embeddings:
             return None, 0.0
         
-        scores = {}
-        
-        for speaker_name, sample_embedding in voice_embeddings.items():
-            seg_norm = segment_embedding / (np.linalg.norm(segment_embedding) + 1e-8)
-            sample_norm = sample_embedding / (np.linalg.norm(sample_embedding) + 1e-8)
-            
-            score = np.dot(seg_norm, sample_norm)
-            scores[speaker_name] = score
+        if voice_embeddings is self.voice_embeddings and self.voice_matrix is not None:
+            names, matrix = self.voice_names, self.voice_matrix
+        else:
+            names, matrix = self._voice_matrix(voice_embeddings)
         
-        best_match = max(scores, key=scores.get)
-        best_score = scores[best_match]
+        # Both sides are unit-norm (get_cluster_embedding / load_voice_samples), so dot == cosine
+        scores = matrix @ np.asarray(segment_embedding, dtype=np.float32)
+        best = int(scores.argmax())
+        best_match, best_score = names[best], float(scores[best])
         
-        logger.info(f"    🔍 Similarity scores:")
-        for name, score in sorted(scores.items(), key=lambda x: x[1], reverse=True):
-            marker = "👉" if name == best_match else "  "
-            logger.info(f"    {marker} {name}: {score:.4f}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"    🔍 Similarity scores:")
+            for i in np.argsort(-scores):
+                marker = "👉" if i == best else "  "
+                logger.info(f"    {marker} {names[i]}: {scores[i]:.4f}")
         
         return best_match, best_score
     
-    def segment_audio_for_speaker_id(self, wav_path, segment_duration=2.0, overlap=0.5):
-        logger.info("Segmenting audio for speaker identification…")
+    def segment_audio_for_speaker_id(self, wav_path, segment_duration=SPEAKER_WINDOW_S, overlap=0.5):
+        import torchaudio
         waveform, sr = torchaudio.load(wav_path)
-        
+        return self.segment_waveform_for_speaker_id(waveform, sr, segment_duration, overlap)
+    
+    def segment_waveform_for_speaker_id(self, waveform, sr, segment_duration=SPEAKER_WINDOW_S, overlap=0.5):
+        """Speaker-ID windows over an already-decoded (channels, T) waveform"""
+        logger.info("Segmenting audio for speaker identification…")
         waveform, sr = self.preprocess_audio_for_speaker_id(waveform, sr)
 
         segment_len = int(segment_duration * sr)
         hop_len = int((segment_duration - overlap) * sr)
         total_len = waveform.shape[1]
 
-        segments, timestamps = [], []
-        for start in range(0, total_len - segment_len, hop_len):
-            end = start + segment_len
-            segments.append(waveform[:, start:end])
-            timestamps.append((start / sr, end / sr))
+        starts = range(0, total_len - segment_len, hop_len)
+        timestamps = [(start / sr, (start + segment_len) / sr) for start in starts]
 
-        logger.info(f"Total segments created for speaker ID: {len(segments)}")
+        logger.info(f"Total segments created for speaker ID: {len(timestamps)}")
+        # Equal-length windows as one (N, T) strided view for the encoder, no per-window copies
+        if timestamps:
+            segments = waveform[0].unfold(0, segment_len, hop_len)[:len(timestamps)]
+        else:
+            segments = waveform[:, :0]
         return segments, timestamps, sr
     
+    @staticmethod
+    def _encode_segments(model, batch, batch_size=ECAPA_BATCH_SIZE):
+        """ECAPA embeddings for an (N, T) waveform batch, encoded batch_size rows per forward pass"""
+        import torch
+        # A compiled encoder keeps one graph per shape, so the short tail batch is zero-padded;
+        # only worth it for the window length it was warmed on (other lengths compile anyway)
+        pad_tail = getattr(model, 'compiled_window', None) == batch.shape[1]
+        device = str(getattr(model, 'device', 'cpu'))
+        device_type = 'cuda' if device.startswith('cuda') else 'cpu'
+        starts = range(0, batch.shape[0], batch_size)
+        embeddings = []
+        
+        if device_type == 'cuda':
+            # Pinned host copies go up on a side stream, so batch i+1 transfers while batch i encodes
+            copy_stream = torch.cuda.Stream()
+            
+            def upload(i):
+                with torch.cuda.stream(copy_stream):
+                    host = batch[i:i + batch_size].float().contiguous().pin_memory()
+                    return host.to(device, non_blocking=True)
+        else:
+            def upload(i):
+                return batch[i:i + batch_size].contiguous()
+        
+        with torch.inference_mode(), torch.autocast(device_type, dtype=torch.float16,
+                                                    enabled=device_type == 'cuda'):
+            pending = upload(0) if len(starts) else None
+            for n, i in enumerate(starts):
+                chunk = pending
+                if device_type == 'cuda':
+                    torch.cuda.current_stream().wait_stream(copy_stream)
+                    chunk.record_stream(torch.cuda.current_stream())
+                if n + 1 < len(starts):
+                    pending = upload(starts[n + 1])
+                rows = chunk.shape[0]
+                if pad_tail and rows < batch_size:
+                    chunk = torch.cat([chunk, chunk.new_zeros(batch_size - rows, chunk.shape[1])])
+                emb = model.encode_batch(chunk)[:rows]
+                embeddings.append(emb.squeeze(1).float().cpu().numpy())
+        if not embeddings:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.concatenate(embeddings, axis=0)
+    
     def extract_embeddings(self, model, segments):
         logger.info("Computing embeddings …")
-        embeddings = []
-        for segment in segments:
-            with torch.no_grad():
-                emb = model.encode_batch(segment).squeeze().cpu().numpy()
-                embeddings.append(emb)
-        embeddings = np.array(embeddings)
+        embeddings = self._encode_segments(model, segments)
         logger.info(f"Computed embeddings for {len(embeddings)} segments")
         return embeddings
     
-    def estimate_speakers(self, embeddings, max_speakers=8):
+    def speaker_distances(self, embeddings):
+        """Condensed pairwise euclidean distances, shared by the linkage and silhouette scoring"""
+        from scipy.spatial.distance import pdist
+        return pdist(np.asarray(embeddings, dtype=np.float32), metric='euclidean')
+    
+    def build_speaker_linkage(self, embeddings, distances=None):
+        """Ward linkage tree over the embeddings; built once, then cut for any k"""
+        from scipy.cluster.hierarchy import linkage
+        if distances is None:
+            distances = self.speaker_distances(embeddings)
+        return linkage(distances, method='ward')
+    
+    def cut_speaker_linkage(self, linkage_tree, k):
+        """Cut the linkage tree into at most k clusters, returning 0-based labels"""
+        from scipy.cluster.hierarchy import fcluster
+        return fcluster(linkage_tree, t=k, criterion='maxclust') - 1
+    
+    @staticmethod
+    def eigengap_speakers(embeddings, max_speakers):
+        """Speaker count from the largest eigengap of the normalized Laplacian of the cosine affinity"""
+        emb = np.asarray(embeddings, dtype=np.float64)
+        emb = emb / (np.linalg.norm(emb, axis=1, keepdims=True) + 1e-8)
+        from scipy.linalg import eigh
+        # N is ~2400 windows per hour of audio (~4800 for 2 h), so the N x N matrices are built in place
+        laplacian = emb @ emb.T
+        np.clip(laplacian, 0.0, None, out=laplacian)
+        d_inv_sqrt = 1.0 / np.sqrt(laplacian.sum(axis=1) + 1e-8)
+        laplacian *= d_inv_sqrt[:, None]
+        laplacian *= d_inv_sqrt[None, :]
+        np.negative(laplacian, out=laplacian)
+        laplacian.flat[::len(emb) + 1] += 1.0
+        # Only the smallest max_speakers + 1 eigenvalues are needed (ascending), not the full spectrum
+        eigvals = eigh(laplacian, eigvals_only=True, subset_by_index=[0, max_speakers])
+        return int(np.argmax(np.diff(eigvals))) + 1
+    
+    def estimate_speakers(self, embeddings, max_speakers=8, linkage_tree=None, distances=None):
+        from scipy.spatial.distance import squareform
+        from sklearn.metrics import silhouette_score
         logger.info("Estimating number of speakers …")
+        upper_k = min(max_speakers, len(embeddings) - 1)
+        if len(embeddings) >= self.EIGENGAP_MIN_SEGMENTS and upper_k >= 2:
+            best_k = min(max(self.eigengap_speakers(embeddings, upper_k), 2), upper_k)
+            logger.info(f"Estimated number of speakers (eigengap): {best_k}")
+            return best_k
+        
         best_k = 3
         best_score = -1
+        
+        if distances is None:
+            distances = self.speaker_distances(embeddings)
+        if linkage_tree is None:
+            linkage_tree = self.build_speaker_linkage(embeddings, distances)
+        # Square distance matrix built once; silhouette_score then never recomputes distances per k
+        distance_matrix = squareform(distances)
 
         for k in range(2, min(max_speakers, len(embeddings))):
-            clustering = AgglomerativeClustering(n_clusters=k)
-            labels = clustering.fit_predict(embeddings)
+            labels = self.cut_speaker_linkage(linkage_tree, k)
             if len(set(labels)) == 1:
                 continue
-            score = silhouette_score(embeddings, labels)
+            score = silhouette_score(distance_matrix, labels, metric='precomputed')
             if score > best_score:
                 best_score = score
                 best_k = k
@@ -1856,10 +2761,18 @@ class EnhancedAudioDiarizer:
         logger.info(f"Estimated number of speakers: {best_k}")
         return best_k
     
-    def diarize(self, embeddings, timestamps):
-        num_speakers = self.estimate_speakers(embeddings)
-        clustering = AgglomerativeClustering(n_clusters=num_speakers)
-        labels = clustering.fit_predict(embeddings)
+    def diarize(self, embeddings, timestamps, num_speakers=None, max_speakers=None):
+        """Cluster segment embeddings; a known num_speakers cuts the tree once with no k sweep"""
+        max_speakers = max_speakers or config.MAX_SPEAKERS
+        distances = self.speaker_distances(embeddings)
+        linkage_tree = self.build_speaker_linkage(embeddings, distances)
+        if num_speakers:
+            num_speakers = min(num_speakers, max_speakers, len(embeddings))
+            logger.info(f"Using known number of speakers: {num_speakers}")
+        else:
+            num_speakers = self.estimate_speakers(embeddings, max_speakers,
+                                                  linkage_tree=linkage_tree, distances=distances)
+        labels = self.cut_speaker_linkage(linkage_tree, num_speakers)
 
         diarization = []
         for i, (start, end) in enumerate(timestamps):
@@ -1882,102 +2795,233 @@ class EnhancedAudioDiarizer:
         merged.append((current_spk, start, end))
         return merged
     
+    def _build_whisper_pipeline(self, **pipeline_kwargs):
+        """Whisper ASR pipeline with WHISPER_GENERATE_KWARGS baked into its generation config"""
+        return self._apply_generation_defaults(self._load_whisper_pipeline(**pipeline_kwargs))
+    
+    def _apply_generation_defaults(self, pipe):
+        """
+        Resolve language/task and the n-gram/repetition settings once on the generation config,
+        so transcription calls pass no generate_kwargs and nothing is rebuilt per segment.
+        """
+        # Newer pipelines keep their own copy of the model's generation config
+        configs = (pipe.model.generation_config, getattr(pipe, "generation_config", None))
+        for gen_config in {id(c): c for c in configs if c is not None}.values():
+            for key, value in self.WHISPER_GENERATE_KWARGS.items():
+                setattr(gen_config, key, value)
+            gen_config.num_beams = 1
+            gen_config.forced_decoder_ids = None  # superseded by language/task
+        return pipe
+    
+    def _load_whisper_pipeline(self, **pipeline_kwargs):
+        """
+        Whisper ASR pipeline with weights quantized per config.WHISPER_QUANT:
+        int8 uses dynamic qint8 Linear layers on CPU and bitsandbytes 8-bit on CUDA,
+        int4 uses bitsandbytes 4-bit (CUDA only), none keeps fp16/fp32.
+        """
+        import torch
+        from transformers import pipeline, AutoModelForSpeechSeq2Seq, AutoProcessor
+        
+        cuda = torch.cuda.is_available()
+        if config.USE_ONNX and not cuda:
+            try:
+                return self._build_onnx_whisper_pipeline(**pipeline_kwargs)
+            except Exception as e:
+                logger.warning(f"⚠️ ONNX Whisper unavailable, falling back to PyTorch: {e}")
+        
+        torch_dtype = torch.float16 if cuda else torch.float32
+        quant = config.WHISPER_QUANT
+        if quant not in ("none", "int8", "int4"):
+            logger.warning(f"⚠️ Unknown WHISPER_QUANT '{quant}', loading unquantized")
+            quant = "none"
+        
+        if quant != "none":
+            try:
+                processor = AutoProcessor.from_pretrained(self.WHISPER_MODEL_ID)
+                if cuda:
+                    from transformers import BitsAndBytesConfig
+                    if quant == "int4":
+                        quant_config = BitsAndBytesConfig(load_in_4bit=True, bnb_4bit_compute_dtype=torch.float16)
+                    else:
+                        quant_config = BitsAndBytesConfig(load_in_8bit=True)
+                    model = AutoModelForSpeechSeq2Seq.from_pretrained(
+                        self.WHISPER_MODEL_ID, quantization_config=quant_config,
+                        torch_dtype=torch_dtype, device_map={"": 0},
+                    )
+                    device_kwargs = {}  # bitsandbytes already placed the weights
+                else:
+                    if quant == "int4":
+                        logger.info("ℹ️ int4 Whisper needs CUDA, using int8 dynamic quantization on CPU")
+                    model = AutoModelForSpeechSeq2Seq.from_pretrained(self.WHISPER_MODEL_ID, torch_dtype=torch_dtype)
+                    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+                    device_kwargs = {"device": -1}
+                
+                logger.info(f"✅ Whisper weights quantized ({quant})")
+                return pipeline(
+                    "automatic-speech-recognition",
+                    model=model,
+                    tokenizer=processor.tokenizer,
+                    feature_extractor=processor.feature_extractor,
+                    torch_dtype=torch_dtype,
+                    **device_kwargs,
+                    **pipeline_kwargs,
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Whisper {quant} quantization unavailable, loading unquantized: {e}")
+        
+        return pipeline(
+            "automatic-speech-recognition",
+            model=self.WHISPER_MODEL_ID,
+            device=0 if cuda else -1,
+            torch_dtype=torch_dtype,
+            **pipeline_kwargs,
+        )
+    
+    def _export_onnx_whisper(self, onnx_dir: str):
+        """One-time ONNX export of Whisper with int8 dynamic quantization of every graph"""
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoProcessor
+        
+        logger.info(f"📦 Exporting Whisper to ONNX int8 in {onnx_dir} (one-time)...")
+        with tempfile.TemporaryDirectory() as export_dir:
+            ORTModelForSpeechSeq2Seq.from_pretrained(self.WHISPER_MODEL_ID, export=True).save_pretrained(export_dir)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+            staging_dir = f"{onnx_dir}.partial"
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            for onnx_file in glob.glob(os.path.join(export_dir, "*.onnx")):
+                quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=os.path.basename(onnx_file))
+                quantizer.quantize(save_dir=staging_dir, quantization_config=qconfig)
+            for json_file in glob.glob(os.path.join(export_dir, "*.json")):
+                shutil.copy2(json_file, staging_dir)
+            AutoProcessor.from_pretrained(self.WHISPER_MODEL_ID).save_pretrained(staging_dir)
+            os.replace(staging_dir, onnx_dir)
+    
+    def _build_onnx_whisper_pipeline(self, **pipeline_kwargs):
+        """Whisper on onnxruntime (CPU, int8), wrapped in the same HF ASR pipeline contract"""
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+        from transformers import pipeline, AutoProcessor
+        
+        onnx_dir = config.WHISPER_ONNX_DIR
+        if not os.path.isdir(onnx_dir):
+            os.makedirs(os.path.dirname(onnx_dir) or ".", exist_ok=True)
+            self._export_onnx_whisper(onnx_dir)
+        
+        def graph(*stems):
+            # Export layout differs between optimum versions (split vs merged decoder)
+            for stem in stems:
+                if os.path.exists(os.path.join(onnx_dir, f"{stem}_quantized.onnx")):
+                    return f"{stem}_quantized.onnx"
+            return None
+        
+        files = {
+            "encoder_file_name": graph("encoder_model"),
+            "decoder_file_name": graph("decoder_model", "decoder_model_merged"),
+            "decoder_with_past_file_name": graph("decoder_with_past_model"),
+        }
+        model = ORTModelForSpeechSeq2Seq.from_pretrained(
+            onnx_dir, provider="CPUExecutionProvider",
+            **{name: f for name, f in files.items() if f},
+        )
+        processor = AutoProcessor.from_pretrained(onnx_dir)
+        logger.info("✅ Whisper loaded on onnxruntime (int8)")
+        return pipeline(
+            "automatic-speech-recognition",
+            model=model,
+            tokenizer=processor.tokenizer,
+            feature_extractor=processor.feature_extractor,
+            **pipeline_kwargs,
+        )
+    
     def load_whisper_model(self):
         if self.whisper_model is not None:
             return self.whisper_model
             
         logger.info("Loading Whisper model (large-v3)…")
-        self.whisper_model = pipeline(
-            "automatic-speech-recognition",
-            model="openai/whisper-large-v3",
-            device=0 if torch.cuda.is_available() else "cpu",
-            chunk_length_s=30,
-            batch_size=8
-        )
+        self.whisper_model = self._build_whisper_pipeline(chunk_length_s=30, batch_size=8)
         return self.whisper_model
     
-    @contextlib.contextmanager
-    def _temp_audio_file(self, audio_np, sr):
-        """Context manager for temporary audio files"""
-        temp_path = None
-        try:
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
-                temp_path = tmp.name
-                sf.write(temp_path, audio_np, sr, subtype='PCM_16')
-                yield temp_path
-        finally:
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to clean up temporary file {temp_path}: {e}")
+    @staticmethod
+    def load_waveform(wav_path):
+        """Decode a WAV once into a mono float32 array; returns (samples, sample_rate)"""
+        waveform_np, sr = sf.read(wav_path, dtype='float32')
+        if waveform_np.ndim > 1:
+            waveform_np = waveform_np.mean(axis=1)
+        return waveform_np, sr
     
-    def transcribe_segment(self, model, audio_path, start, end, sr):
-        logger.info(f"    🎙️ Transcribing {start:.2f}s - {end:.2f}s...")
-        
-        waveform, original_sr = torchaudio.load(audio_path)
-        
-        if original_sr != sr:
-            start_original = int(start * original_sr)
-            end_original = int(end * original_sr)
+    def _prepare_segment(self, waveform_np, start, end, sr):
+        """
+        Slice [start, end) seconds out of the in-memory waveform and clean it up for Whisper.
+        Returns the placeholder transcript instead when there is nothing worth running Whisper on.
+        """
+        audio_np = waveform_np[int(start * sr):min(int(end * sr), len(waveform_np))]
+        if len(audio_np) == 0:
+            return "[No audio in this segment]"
+        audio_np = self.preprocess_audio_simple(audio_np, sr)
+        if audio_np is None:
+            logger.info(f"    ⚠️ No speech detected")
+            return "[No speech detected]"
+        return audio_np
+    
+    def _transcription_text(self, result):
+        """Normalize a pipeline result into cleaned transcript text"""
+        if isinstance(result, dict):
+            text = result.get("text", "[No transcription]").strip()
         else:
-            start_original = int(start * sr)
-            end_original = int(end * sr)
-        
-        end_original = min(end_original, waveform.shape[1])
+            text = str(result).strip()
         
-        segment = waveform[:, start_original:end_original]
-        
-        if segment.shape[1] == 0:
-            return "[No audio in this segment]"
+        if text and text not in ["[No audio in this segment]", "[Transcription failed]", ""]:
+            text = self.remove_repeated_words(text)
+            logger.info(f"    ✅ Transcription complete (after deduplication)")
+            return text
+        logger.info(f"    ⚠️ No speech detected")
+        return "[No speech detected]"
+    
+    def transcribe_segment(self, model, waveform_np, start, end, sr):
+        """Transcribe one slice of an already-decoded waveform, no temp files involved"""
+        logger.info(f"    🎙️ Transcribing {start:.2f}s - {end:.2f}s...")
         
-        audio_np = segment.squeeze().numpy()
+        audio_np = self._prepare_segment(waveform_np, start, end, sr)
+        if isinstance(audio_np, str):
+            return audio_np
         
-        if audio_np.ndim > 1:
-            audio_np = audio_np.mean(axis=0)
+        try:
+            result = model({"array": audio_np, "sampling_rate": sr})
+            return self._transcription_text(result)
+        except Exception as e:
+            logger.error(f"    ❌ Transcription error: {e}")
+            return "[Transcription failed]"
+    
+    def transcribe_segments(self, model, waveform_np, spans, sr, batch_size=None):
+        """
+        Transcribe many (start, end) spans with one batched pipeline call.
+        The call runs all spans up front; texts are then yielded in span order. If the batch
+        fails, each span is retried on its own with transcribe_segment.
+        """
+        import torch
+        if batch_size is None:
+            device = getattr(model, 'device', None)
+            batch_size = 16 if getattr(device, 'type', None) == 'cuda' else 4
         
-        audio_np = self.preprocess_audio_simple(audio_np, original_sr)
+        prepared = [self._prepare_segment(waveform_np, start, end, sr) for start, end in spans]
+        inputs = [{"array": audio_np, "sampling_rate": sr} for audio_np in prepared if not isinstance(audio_np, str)]
+        logger.info(f"    🎙️ Transcribing {len(inputs)} segments (batch size {batch_size})...")
         
-        # Use context manager for temporary file
-        with self._temp_audio_file(audio_np, original_sr) as temp_file:
+        outputs = None
+        if inputs:
             try:
-                duration = len(audio_np) / original_sr
-                
-                result = model(
-                    temp_file, 
-                    generate_kwargs={
-                        "task": "transcribe",
-                        "language": "en",
-                        "no_repeat_ngram_size": 3,
-                        "repetition_penalty": 1.2,
-                    }
-                )
-                
-                if isinstance(result, dict):
-                    text = result.get("text", "[No transcription]").strip()
-                else:
-                    text = str(result).strip()
-                
-                if text and text not in ["[No audio in this segment]", "[Transcription failed]", ""]:
-                    text = self.remove_repeated_words(text)
-                    logger.info(f"    ✅ Transcription complete (after deduplication)")
-                    return text
-                else:
-                    logger.info(f"    ⚠️ No speech detected")
-                    return "[No speech detected]"
-                
-            except FileNotFoundError as e:
-                logger.error(f"    ❌ File not found: {e}")
-                return "[Transcription failed - file error]"
-            except PermissionError as e:
-                logger.error(f"    ❌ Permission denied: {e}")
-                return "[Transcription failed - permission error]"
-            except (OSError, IOError) as e:
-                logger.error(f"    ❌ IO error: {e}")
-                return "[Transcription failed - IO error]"
+                with torch.inference_mode():
+                    outputs = iter(model(inputs, batch_size=batch_size))
             except Exception as e:
-                logger.error(f"    ❌ Transcription error: {e}")
-                return "[Transcription failed]"
+                logger.error(f"    ❌ Batched transcription error: {e}, retrying segments one by one")
+        
+        for (start, end), audio_np in zip(spans, prepared):
+            if isinstance(audio_np, str):
+                yield audio_np
+            elif outputs is None:
+                yield self.transcribe_segment(model, waveform_np, start, end, sr)
+            else:
+                yield self._transcription_text(next(outputs))
     
     def get_cluster_embedding(self, embeddings, diarization, speaker_id):
         speaker_embeddings = []
@@ -1993,7 +3037,8 @@ class EnhancedAudioDiarizer:
         
         return normalized_emb
     
-    def diarize_audio(self, audio_path, agenda="", use_manual_fallback=True, meeting_title=""):
+    def diarize_audio(self, audio_path, agenda="", use_manual_fallback=True, meeting_title="", num_speakers=None):
+        import torch
         self.current_progress = 0
         self.progress_message = "Starting diarization..."
         logger.info("🎧 Diarization started with progress tracking")
@@ -2005,6 +3050,7 @@ class EnhancedAudioDiarizer:
             
             self.progress_message = "Loading speaker embedding model..."
             self.current_progress = 15
+            self._wait_for_models()
             model_spk = self.load_embedding_model()
             
             self.progress_message = "Loading voice samples from database..."
@@ -2017,7 +3063,11 @@ class EnhancedAudioDiarizer:
 
             self.progress_message = "Segmenting audio for speaker identification..."
             self.current_progress = 45
-            segments, timestamps, processed_sr = self.segment_audio_for_speaker_id(wav_path)
+            # Decode once; speaker segmentation and every transcription work from this array
+            waveform_np, wav_sr = self.load_waveform(wav_path)
+            segments, timestamps, _ = self.segment_waveform_for_speaker_id(
+                torch.from_numpy(waveform_np).unsqueeze(0), wav_sr
+            )
             
             self.progress_message = "Extracting speaker embeddings..."
             self.current_progress = 55
@@ -2025,7 +3075,7 @@ class EnhancedAudioDiarizer:
             
             self.progress_message = "Performing speaker clustering..."
             self.current_progress = 65
-            diarization = self.diarize(embeddings, timestamps)
+            diarization = self.diarize(embeddings, timestamps, num_speakers=num_speakers)
             
             self.progress_message = "Merging adjacent speaker segments..."
             self.current_progress = 75
@@ -2048,11 +3098,7 @@ class EnhancedAudioDiarizer:
 
             logger.info(f"\n📊 After filtering: {len(filtered_segments)} segments (removed {len(merged) - len(filtered_segments)} short segments)\n")
 
-            for idx, (spk, start, end) in enumerate(filtered_segments):
-                progress = 80 + (idx / len(filtered_segments) * 15) if filtered_segments else 80
-                self.current_progress = progress
-                self.progress_message = f"Transcribing segment {idx + 1}/{len(filtered_segments)}..."
-                
+            for spk, start, end in filtered_segments:
                 if spk not in speaker_map:
                     cluster_embedding = self.get_cluster_embedding(embeddings, diarization, spk)
                     
@@ -2070,10 +3116,16 @@ class EnhancedAudioDiarizer:
                         unknown_counter = len(speaker_map) + 1
                         speaker_map[spk] = f"Unknown_{unknown_counter}"
                         logger.info(f"❓ Speaker {spk} not recognized, labeled as {speaker_map[spk]}")
+            
+            # All segments go through the pipeline in one batched pass
+            texts = self.transcribe_segments(
+                whisper_model, waveform_np, [(start, end) for _, start, end in filtered_segments], wav_sr
+            )
+            for idx, ((spk, start, end), text) in enumerate(zip(filtered_segments, texts)):
+                self.current_progress = 80 + ((idx + 1) / len(filtered_segments) * 15)
+                self.progress_message = f"Transcribed segment {idx + 1}/{len(filtered_segments)}..."
                 
                 name = speaker_map[spk]
-                
-                text = self.transcribe_segment(whisper_model, wav_path, start, end, processed_sr)
                 duration = round(end - start, 2)
 
                 logger.info(f"\n{name} ({start:.2f}s - {end:.2f}s | {duration}s): {text}")
@@ -2115,13 +3167,47 @@ class EnhancedAudioDiarizer:
             logger.error(f"❌ Diarization failed: {e}")
             return None
 
+_WORD_RE = re.compile(r'\b\w+\b')
+
+_PRIORITY_COLORS = {
+    "High": colors.HexColor("#D32F2F"),
+    "Medium": colors.HexColor("#FF9800"),
+    "Low": colors.HexColor("#388E3C"),
+}
+
+# Lookaheads keep the original precedence: any 'high' beats any 'med', everything else is low
+_PRIORITY_RE = re.compile(r'(?=.*(high))|(?=.*(med))', re.IGNORECASE | re.DOTALL)
+
+def _classify_priority(cell):
+    match = _PRIORITY_RE.match(cell)
+    return ("High", "Medium")[match.lastindex - 1] if match else "Low"
+
+# Fixed-height gaps reused across the story; a Spacer keeps no layout state between draws
+_SPACER_3 = Spacer(1, 3)
+_SPACER_5 = Spacer(1, 5)
+_SPACER_8 = Spacer(1, 8)
+_SPACER_10 = Spacer(1, 10)
+_SPACER_15 = Spacer(1, 15)
+
 class BalancedMeetingSummarizer:
+    SECTION_ORDER = (
+        "1. EXECUTIVE SUMMARY",
+        "2. KEY DECISIONS & OUTCOMES",
+        "3. PARTICIPANT KEY POINTS",
+        "4. ACTION ITEMS",
+        "5. AGENDA ANALYSIS",
+        "6. KEY METRICS & DATA POINTS",
+        "7. NEXT STEPS & RECOMMENDATIONS",
+    )
+
     def __init__(self):
         self.company_name = "Asgard Analytics"
         self.company_tagline = "Intelligent Meeting Documentation"
+        self._segment_index_cache = (None, [])
         self._setup_configuration()
         self._setup_folders()
         self._setup_balanced_styles()
+        self._setup_section_dispatch()
 
     def _setup_configuration(self):
         # Use config instance instead of direct os.getenv
@@ -2132,6 +3218,18 @@ class BalancedMeetingSummarizer:
         self.max_tokens = config.LLM_MAX_TOKENS
         self.timeout = config.LLM_TIMEOUT
         
+        # One pooled session so repeated LLM calls reuse the TCP/TLS connection
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/meeting-summarizer",
+            "X-Title": "Meeting Summarizer"
+        })
+        
         logger.info(f"🤖 LLM Configuration loaded: {self.model}")
 
     def _setup_folders(self):
@@ -2208,6 +3306,92 @@ class BalancedMeetingSummarizer:
             leading=14
         )
 
+        # Body styles reused for every bullet, line and table cell of the PDF
+        self.pro_styles['KeyPoint'] = ParagraphStyle(
+            name='KeyPoint',
+            parent=self.styles['Normal'],
+            fontSize=10,
+            textColor=colors.HexColor("#333333"),
+            leftIndent=15,
+            spaceAfter=3,
+            fontName='Helvetica',
+            leading=12,
+            wordWrap='LTR'
+        )
+
+        self.pro_styles['Regular'] = ParagraphStyle(
+            name='Regular',
+            parent=self.styles['Normal'],
+            fontSize=10,
+            textColor=colors.black,
+            spaceAfter=4,
+            fontName='Helvetica',
+            leading=12,
+            wordWrap='LTR'
+        )
+
+        self.pro_styles['Subsection'] = ParagraphStyle(
+            name='Subsection',
+            fontName='Helvetica-Bold',
+            fontSize=12,
+            textColor=colors.HexColor("#0D47A1"),
+            spaceAfter=4
+        )
+
+        for name, color in (('ContributionsTitle', "#0D47A1"), ('TopicsTitle', "#0D47A1"), ('TopicsNotTitle', "#FF9800")):
+            self.pro_styles[name] = ParagraphStyle(
+                name=name,
+                fontName='Helvetica-Bold',
+                fontSize=12,
+                textColor=colors.HexColor(color),
+                spaceAfter=8 if name == 'ContributionsTitle' else 6
+            )
+
+        self.pro_styles['ParticipantName'] = ParagraphStyle(
+            name='ParticipantName',
+            fontName='Helvetica-Bold',
+            fontSize=11,
+            textColor=colors.HexColor("#0D47A1"),
+            spaceAfter=2,
+            spaceBefore=6
+        )
+        self.pro_styles['ParticipantNameCompact'] = ParagraphStyle(
+            name='ParticipantNameCompact',
+            parent=self.pro_styles['ParticipantName'],
+            spaceBefore=0
+        )
+
+        self.pro_styles['TableID'] = ParagraphStyle(
+            name='TableID',
+            fontName='Helvetica-Bold',
+            fontSize=10,
+            alignment=TA_CENTER
+        )
+
+        self.pro_styles['TableTask'] = ParagraphStyle(
+            name='TableTask',
+            fontName='Helvetica',
+            fontSize=10,
+            textColor=colors.black,
+            wordWrap='LTR',
+            leading=12
+        )
+
+        self.pro_styles['TableResponsible'] = ParagraphStyle(
+            name='TableResponsible',
+            fontName='Helvetica',
+            fontSize=10,
+            alignment=TA_CENTER,
+            wordWrap='LTR'
+        )
+
+        self.pro_styles['TableDeadline'] = ParagraphStyle(
+            name='TableDeadline',
+            fontName='Helvetica',
+            fontSize=10,
+            alignment=TA_CENTER
+        )
+
     def create_professional_header_footer(self, canvas, doc):
         canvas.saveState()
 
@@ -2235,8 +3419,8 @@ class BalancedMeetingSummarizer:
         canvas.drawCentredString(doc.pagesize[0] / 2, 0.25 * inch, f"Page {doc.page}")
 
         canvas.setFont("Helvetica", 8)
-        timestamp = datetime.now().strftime("%Y-%m%d %H:%M")
-        footer_left = f"© {datetime.now().year} {self.company_name} | Generated: {timestamp}"
+        timestamp = doc.build_time.strftime("%Y-%m%d %H:%M")
+        footer_left = f"© {doc.build_time.year} {self.company_name} | Generated: {timestamp}"
         canvas.drawString(0.7 * inch, 0.15 * inch, footer_left)
         canvas.drawRightString(doc.pagesize[0] - 0.7 * inch, 0.15 * inch, "CONFIDENTIAL")
 
@@ -2253,24 +3437,13 @@ class BalancedMeetingSummarizer:
         canvas.drawCentredString(doc.pagesize[0] / 2, 0.25 * inch, f"Page {doc.page}")
         
         canvas.setFont("Helvetica", 8)
-        canvas.drawString(0.7 * inch, 0.1 * inch, f"© {datetime.now().year} {self.company_name}")
+        canvas.drawString(0.7 * inch, 0.1 * inch, f"© {doc.build_time.year} {self.company_name}")
         canvas.drawRightString(doc.pagesize[0] - 0.7 * inch, 0.1 * inch, "CONFIDENTIAL")
         
         canvas.restoreState()
 
-    def _call_llm(self, prompt, max_tokens=4000, temperature=0.7):
-        if not self.api_key:
-            logger.warning("API key not configured, using fallback summary")
-            return None
-        
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/meeting-summarizer",
-            "X-Title": "Meeting Summarizer"
-        }
-        
-        payload = {
+    def _llm_payload(self, prompt, max_tokens, temperature):
+        return {
             "model": self.model,
             "messages": [
                 {
@@ -2281,12 +3454,16 @@ class BalancedMeetingSummarizer:
             "max_tokens": max_tokens,
             "temperature": temperature
         }
+
+    def _call_llm(self, prompt, max_tokens=4000, temperature=0.7):
+        if not self.api_key:
+            logger.warning("API key not configured, using fallback summary")
+            return None
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
+                json=self._llm_payload(prompt, max_tokens, temperature),
                 timeout=self.timeout
             )
             response.raise_for_status()
@@ -2296,11 +3473,59 @@ class BalancedMeetingSummarizer:
             logger.error(f"❌ API request failed: {e}")
             return None
 
+    async def _call_llm_async(self, client, prompt, max_tokens=4000, temperature=0.7):
+        try:
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                json=self._llm_payload(prompt, max_tokens, temperature),
+            )
+            response.raise_for_status()
+            return response.json()['choices'][0]['message']['content']
+        except Exception as e:
+            logger.error(f"❌ API request failed: {e}")
+            return None
+
+    async def _call_llm_many(self, prompts, max_tokens=4000, temperature=0.7):
+        """Send several prompts concurrently over one pooled async client; results keep prompt order"""
+        import httpx
+        if not self.api_key:
+            logger.warning("API key not configured, using fallback summary")
+            return [None] * len(prompts)
+        
+        async with httpx.AsyncClient(
+            headers=dict(self.session.headers),
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        ) as client:
+            return await asyncio.gather(*(
+                self._call_llm_async(client, prompt, max_tokens, temperature) for prompt in prompts
+            ))
+
+    def _segment_index(self, transcripts):
+        """
+        Per-segment {'speaker', 'text', 'word_count'}, computed once per transcript list.
+        The analysis prompt, agenda matching and every PDF statistic read from this instead of re-splitting.
+        """
+        cached_transcripts, index = self._segment_index_cache
+        if cached_transcripts is not transcripts:
+            index = []
+            for segment in transcripts:
+                text = segment.get('transcript', '')
+                index.append({
+                    'speaker': segment.get('speaker', 'Unknown'),
+                    'text': text,
+                    'word_count': len(text.split()),
+                })
+            self._segment_index_cache = (transcripts, index)
+        return index
+
     def _extract_agenda_analysis(self, transcripts, agenda):
-        all_text = " ".join([t.get('transcript', '') for t in transcripts]).lower()
-        agenda_words = set(re.findall(r'\b\w+\b', agenda.lower()))
+        # Hash lookups against the transcript's word set instead of a substring scan per agenda word
+        all_text = " ".join(s['text'] for s in self._segment_index(transcripts))
+        text_words = set(_WORD_RE.findall(all_text.lower()))
+        agenda_words = set(_WORD_RE.findall(agenda.lower()))
 
-        relevant_words = [word for word in agenda_words if word in all_text and len(word) > 3]
+        relevant_words = [word for word in agenda_words if len(word) > 3 and word in text_words]
         relevance_percentage = (len(relevant_words) / len(agenda_words) * 100) if agenda_words else 0
 
         return {
@@ -2310,12 +3535,7 @@ class BalancedMeetingSummarizer:
         }
 
     def _format_transcript_for_analysis(self, transcripts):
-        formatted = ""
-        for segment in transcripts:
-            speaker = segment.get('speaker', 'Unknown')
-            transcript = segment.get('transcript', '')
-            formatted += f"{speaker}: {transcript}\n\n"
-        return formatted
+        return "".join(f"{s['speaker']}: {s['text']}\n\n" for s in self._segment_index(transcripts))
 
     def _wrap_table_text(self, text, max_length=80):
         if len(text) <= max_length:
@@ -2324,14 +3544,18 @@ class BalancedMeetingSummarizer:
         words = text.split()
         lines = []
         current_line = []
+        current_length = 0  # length of ' '.join(current_line), tracked instead of re-joined per word
         
         for word in words:
-            if len(' '.join(current_line + [word])) <= max_length:
+            added = len(word) + (1 if current_line else 0)
+            if current_length + added <= max_length:
                 current_line.append(word)
+                current_length += added
             else:
                 if current_line:
                     lines.append(' '.join(current_line))
                 current_line = [word]
+                current_length = len(word)
         
         if current_line:
             lines.append(' '.join(current_line))
@@ -2339,32 +3563,23 @@ class BalancedMeetingSummarizer:
         return '\n'.join(lines)
 
     def _parse_analysis_sections(self, analysis):
-        sections = {}
-        current_section = None
-        current_content = []
-
-        lines = analysis.split('\n')
-
-        for line in lines:
-            line = line.strip()
-
-            if line.startswith('## '):
-                if current_section is not None:
-                    sections[current_section] = '\n'.join(current_content).strip()
-                    current_content = []
-                current_section = line[3:].strip()
-            elif current_section is not None:
-                if line or current_content:
-                    current_content.append(line)
+        lines = [line.strip() for line in analysis.split('\n')]
+        headers = [i for i, line in enumerate(lines) if line.startswith('## ')]
 
-        if current_section is not None and current_content:
-            sections[current_section] = '\n'.join(current_content).strip()
+        # Each section is the slice of lines between its '## ' header and the next one
+        sections = {}
+        for n, start in enumerate(headers):
+            end = headers[n + 1] if n + 1 < len(headers) else len(lines)
+            content = '\n'.join(lines[start + 1:end]).strip()
+            if content or end != len(lines):  # a trailing header with no body is dropped
+                sections[lines[start][3:].strip()] = content
 
         return sections
 
     def _create_balanced_action_items(self, story, content):
         lines = content.split('\n')
         table_data = [['ID', 'Task Description', 'Responsible', 'Deadline', 'Priority']]
+        priority_styles = []
 
         in_table = False
         for line in lines:
@@ -2378,55 +3593,18 @@ class BalancedMeetingSummarizer:
                     task_desc = self._wrap_table_text(cells[1], max_length=60)
                     responsible = self._wrap_table_text(cells[2], max_length=20)
                     
-                    priority = cells[4].lower()
-                    if 'high' in priority:
-                        priority_color = colors.HexColor("#D32F2F")
-                        priority_text = "High"
-                    elif 'medium' in priority or 'med' in priority:
-                        priority_color = colors.HexColor("#FF9800")
-                        priority_text = "Medium"
-                    else:
-                        priority_color = colors.HexColor("#388E3C")
-                        priority_text = "Low"
+                    priority_text = _classify_priority(cells[4])
                     
-                    priority_cell = Paragraph(priority_text,
-                        ParagraphStyle(
-                            name='PriorityStyle',
-                            fontName='Helvetica-Bold',
-                            fontSize=9,
-                            textColor=priority_color,
-                            alignment=TA_CENTER
-                        ))
-
+                    # Priority is one of three short words: a plain cell styled by TableStyle commands.
+                    # The ID is free LLM text in a narrow column, so it stays a wrapping Paragraph
+                    priority_styles.append(('TEXTCOLOR', (4, len(table_data)), (4, len(table_data)),
+                                            _PRIORITY_COLORS[priority_text]))
                     table_data.append([
-                        Paragraph(cells[0], ParagraphStyle(
-                            name='TableID',
-                            fontName='Helvetica-Bold',
-                            fontSize=10,
-                            alignment=TA_CENTER
-                        )),
-                        Paragraph(task_desc, ParagraphStyle(
-                            name='TableTask',
-                            fontName='Helvetica',
-                            fontSize=10,
-                            textColor=colors.black,
-                            wordWrap='LTR',
-                            leading=12
-                        )),
-                        Paragraph(responsible, ParagraphStyle(
-                            name='TableResponsible',
-                            fontName='Helvetica',
-                            fontSize=10,
-                            alignment=TA_CENTER,
-                            wordWrap='LTR'
-                        )),
-                        Paragraph(cells[3], ParagraphStyle(
-                            name='TableDeadline',
-                            fontName='Helvetica',
-                            fontSize=10,
-                            alignment=TA_CENTER
-                        )),
-                        priority_cell
+                        Paragraph(cells[0], self.pro_styles['TableID']),
+                        Paragraph(task_desc, self.pro_styles['TableTask']),
+                        Paragraph(responsible, self.pro_styles['TableResponsible']),
+                        Paragraph(cells[3], self.pro_styles['TableDeadline']),
+                        priority_text
                     ])
             elif in_table and not line:
                 break
@@ -2450,21 +3628,28 @@ class BalancedMeetingSummarizer:
                 ('ALIGN', (3, 0), (3, -1), 'CENTER'),
                 ('ALIGN', (4, 0), (4, -1), 'CENTER'),
                 ('LEADING', (0, 0), (-1, -1), 12),
-            ]))
+                ('FONTNAME', (4, 1), (4, -1), "Helvetica-Bold"),
+                ('FONTSIZE', (4, 1), (4, -1), 9),
+            ] + priority_styles))
             
             story.append(KeepTogether(table))
         else:
             story.append(Paragraph(content, self.pro_styles['Regular']))
 
     def _create_balanced_participant_points(self, story, content, transcript_data):
-        speakers = list(set(segment.get('speaker', 'Unknown') for segment in transcript_data.get('transcript', [])))
+        # One pass over the transcript: per-speaker [segments, words] in first-appearance order
+        counts = {}
+        total_words = 0
+        for segment in self._segment_index(transcript_data.get('transcript', [])):
+            word_count = segment['word_count']
+            entry = counts.setdefault(segment['speaker'], [0, 0])
+            entry[0] += 1
+            entry[1] += word_count
+            total_words += word_count
+        speakers = list(counts)
 
         speaker_stats = []
-        for speaker in speakers:
-            speaker_segments = [t for t in transcript_data.get('transcript', []) if t.get('speaker') == speaker]
-            word_count = sum(len(t.get('transcript', '').split()) for t in speaker_segments)
-            segment_count = len(speaker_segments)
-            total_words = sum(len(t.get('transcript', '').split()) for t in transcript_data.get('transcript', []))
+        for speaker, (segment_count, word_count) in counts.items():
             percentage = (word_count / total_words * 100) if total_words > 0 else 0
             speaker_stats.append([speaker, str(segment_count), str(word_count), f"{percentage:.1f}%"])
 
@@ -2486,7 +3671,7 @@ class BalancedMeetingSummarizer:
             ]))
             
             story.append(stats_table)
-            story.append(Spacer(1, 15))
+            story.append(_SPACER_15)
 
         lines = content.split('\n')
         current_participant = None
@@ -2504,70 +3689,31 @@ class BalancedMeetingSummarizer:
                 participant_points[current_participant].append(point)
 
         if participant_points:
-            story.append(Paragraph("Key Contributions", ParagraphStyle(
-                name='ContributionsTitle',
-                fontName='Helvetica-Bold',
-                fontSize=12,
-                textColor=colors.HexColor("#0D47A1"),
-                spaceAfter=8
-            )))
+            story.append(Paragraph("Key Contributions", self.pro_styles['ContributionsTitle']))
 
             for participant, points in participant_points.items():
                 if len(participant) > 40:
                     participant = self._wrap_table_text(participant, max_length=40)
                 
-                story.append(Paragraph(f"<b>{participant}</b>", ParagraphStyle(
-                    name='ParticipantName',
-                    fontName='Helvetica-Bold',
-                    fontSize=11,
-                    textColor=colors.HexColor("#0D47A1"),
-                    spaceAfter=2,
-                    spaceBefore=6
-                )))
+                story.append(Paragraph(f"<b>{participant}</b>", self.pro_styles['ParticipantName']))
 
                 for point in points[:3]:
-                    story.append(Paragraph(f"• {point}", ParagraphStyle(
-                        name='KeyPoint',
-                        parent=self.styles['Normal'],
-                        fontSize=10,
-                        textColor=colors.HexColor("#333333"),
-                        leftIndent=15,
-                        spaceAfter=3,
-                        fontName='Helvetica',
-                        leading=12,
-                        wordWrap='LTR'
-                    )))
-
-                story.append(Spacer(1, 8))
+                    story.append(Paragraph(f"• {point}", self.pro_styles['KeyPoint']))
+
+                story.append(_SPACER_8)
         else:
             for speaker in speakers[:10]:
-                story.append(Paragraph(f"<b>{speaker}</b>", ParagraphStyle(
-                    name='ParticipantName',
-                    fontName='Helvetica-Bold',
-                    fontSize=11,
-                    textColor=colors.HexColor("#0D47A1"),
-                    spaceAfter=2
-                )))
-                story.append(Paragraph("• Contributed to key discussions", ParagraphStyle(
-                    name='KeyPoint',
-                    parent=self.styles['Normal'],
-                    fontSize=10,
-                    textColor=colors.HexColor("#333333"),
-                    leftIndent=15,
-                    spaceAfter=3,
-                    fontName='Helvetica',
-                    leading=12,
-                    wordWrap='LTR'
-                )))
-                story.append(Spacer(1, 5))
+                story.append(Paragraph(f"<b>{speaker}</b>", self.pro_styles['ParticipantNameCompact']))
+                story.append(Paragraph("• Contributed to key discussions", self.pro_styles['KeyPoint']))
+                story.append(_SPACER_5)
 
     def _create_agenda_analysis_section(self, story, content):
-        lines = content.split('\n')
-        topics_covered = []
-        topics_not_covered = []
+        topics = {'covered': [], 'not_covered': []}
         current_section = None
+        assessment = None
 
-        for line in lines:
+        # Single pass: bucket the topic bullets and remember the first agenda assessment line
+        for line in content.split('\n'):
             line = line.strip()
             if line.startswith('### Topics Covered'):
                 current_section = 'covered'
@@ -2575,78 +3721,27 @@ class BalancedMeetingSummarizer:
                 current_section = 'not_covered'
             elif line.startswith('### Agenda Adherence'):
                 current_section = 'assessment'
-            elif line.startswith('• ') and current_section == 'covered':
-                topic = line[2:].strip()
-                if len(topic) > 100:
-                    topic = self._wrap_table_text(topic, max_length=100)
-                topics_covered.append(topic)
-            elif line.startswith('• ') and current_section == 'not_covered':
-                topic = line[2:].strip()
-                if len(topic) > 100:
-                    topic = self._wrap_table_text(topic, max_length=100)
-                topics_not_covered.append(topic)
-
-        if topics_covered:
-            story.append(Paragraph("Topics Discussed", ParagraphStyle(
-                name='TopicsTitle',
-                fontName='Helvetica-Bold',
-                fontSize=12,
-                textColor=colors.HexColor("#0D47A1"),
-                spaceAfter=6
-            )))
-            for topic in topics_covered[:5]:
-                story.append(Paragraph(f"• {topic}", ParagraphStyle(
-                    name='KeyPoint',
-                    parent=self.styles['Normal'],
-                    fontSize=10,
-                    textColor=colors.HexColor("#333333"),
-                    leftIndent=15,
-                    spaceAfter=3,
-                    fontName='Helvetica',
-                    leading=12,
-                    wordWrap='LTR'
-                )))
-            story.append(Spacer(1, 10))
-
-        if topics_not_covered:
-            story.append(Paragraph("Topics Not Discussed", ParagraphStyle(
-                name='TopicsNotTitle',
-                fontName='Helvetica-Bold',
-                fontSize=12,
-                textColor=colors.HexColor("#FF9800"),
-                spaceAfter=6
-            )))
-            for topic in topics_not_covered[:3]:
-                story.append(Paragraph(f"• {topic}", ParagraphStyle(
-                    name='KeyPoint',
-                    parent=self.styles['Normal'],
-                    fontSize=10,
-                    textColor=colors.HexColor("#333333"),
-                    leftIndent=15,
-                    spaceAfter=3,
-                    fontName='Helvetica',
-                    leading=12,
-                    wordWrap='LTR'
-                )))
-            story.append(Spacer(1, 10))
-
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('###') and not line.startswith('•'):
-                if 'agenda' in line.lower() or 'adherence' in line.lower() or 'focused' in line.lower():
-                    if len(line) > 120:
-                        line = self._wrap_table_text(line, max_length=120)
-                    story.append(Paragraph(line, ParagraphStyle(
-                        name='Regular',
-                        parent=self.styles['Normal'],
-                        fontSize=10,
-                        textColor=colors.black,
-                        spaceAfter=4,
-                        fontName='Helvetica',
-                        leading=12,
-                        wordWrap='LTR'
-                    )))
-                    break
+            elif line.startswith('• ') and current_section in topics:
+                topics[current_section].append(line[2:].strip())
+            elif (assessment is None and line and not line.startswith('###') and not line.startswith('•')
+                    and any(keyword in line.lower() for keyword in ('agenda', 'adherence', 'focused'))):
+                assessment = line
+
+        # Only the topics actually rendered get wrapped
+        if topics['covered']:
+            story.append(Paragraph("Topics Discussed", self.pro_styles['TopicsTitle']))
+            for topic in topics['covered'][:5]:
+                story.append(Paragraph(f"• {self._wrap_table_text(topic, max_length=100)}", self.pro_styles['KeyPoint']))
+            story.append(_SPACER_10)
+
+        if topics['not_covered']:
+            story.append(Paragraph("Topics Not Discussed", self.pro_styles['TopicsNotTitle']))
+            for topic in topics['not_covered'][:3]:
+                story.append(Paragraph(f"• {self._wrap_table_text(topic, max_length=100)}", self.pro_styles['KeyPoint']))
+            story.append(_SPACER_10)
+
+        if assessment is not None:
+            story.append(Paragraph(self._wrap_table_text(assessment, max_length=120), self.pro_styles['Regular']))
 
     def _add_balanced_text_content(self, story, content):
         lines = content.split('\n')
@@ -2658,55 +3753,21 @@ class BalancedMeetingSummarizer:
                     bullet_text = line[2:]
                     if len(bullet_text) > 100:
                         bullet_text = self._wrap_table_text(bullet_text, max_length=100)
-                    story.append(Paragraph(f"• {bullet_text}", ParagraphStyle(
-                        name='KeyPoint',
-                        parent=self.styles['Normal'],
-                        fontSize=10,
-                        textColor=colors.HexColor("#333333"),
-                        leftIndent=15,
-                        spaceAfter=3,
-                        fontName='Helvetica',
-                        leading=12,
-                        wordWrap='LTR'
-                    )))
+                    story.append(Paragraph(f"• {bullet_text}", self.pro_styles['KeyPoint']))
                 elif line.startswith('### '):
-                    story.append(Paragraph(line[4:], ParagraphStyle(
-                        name='Subsection',
-                        fontName='Helvetica-Bold',
-                        fontSize=12,
-                        textColor=colors.HexColor("#0D47A1"),
-                        spaceAfter=4
-                    )))
-                    story.append(Spacer(1, 5))
+                    story.append(Paragraph(line[4:], self.pro_styles['Subsection']))
+                    story.append(_SPACER_5)
                 elif ':' in line and len(line) < 120:
                     parts = line.split(':', 1)
                     if len(parts) == 2:
-                        story.append(Paragraph(f"<b>{parts[0]}:</b> {parts[1]}", ParagraphStyle(
-                            name='Regular',
-                            parent=self.styles['Normal'],
-                            fontSize=10,
-                            textColor=colors.black,
-                            spaceAfter=4,
-                            fontName='Helvetica',
-                            leading=12,
-                            wordWrap='LTR'
-                        )))
+                        story.append(Paragraph(f"<b>{parts[0]}:</b> {parts[1]}", self.pro_styles['Regular']))
                 else:
                     if len(line) > 120:
                         line = self._wrap_table_text(line, max_length=120)
-                    story.append(Paragraph(line, ParagraphStyle(
-                        name='Regular',
-                        parent=self.styles['Normal'],
-                        fontSize=10,
-                        textColor=colors.black,
-                        spaceAfter=4,
-                        fontName='Helvetica',
-                        leading=12,
-                        wordWrap='LTR'
-                    )))
-                story.append(Spacer(1, 3))
-
-    def _create_first_page(self, story, meeting_id, transcript_data, agenda_analysis, meeting_title, agenda):
+                    story.append(Paragraph(line, self.pro_styles['Regular']))
+                story.append(_SPACER_3)
+
+    def _create_first_page(self, story, meeting_id, transcript_data, agenda_analysis, meeting_title, agenda, build_time):
         story.append(Spacer(1, 0.8 * inch))
         
         story.append(Paragraph("MEETING MINUTES", self.pro_styles['FirstPageTitle']))
@@ -2758,7 +3819,7 @@ class BalancedMeetingSummarizer:
             duration_formatted = f"{seconds} seconds"
         
         participants = transcript_data.get('unique_speakers', 0)
-        total_words = sum(len(segment.get('transcript', '').split()) for segment in transcript_data.get('transcript', []))
+        total_words = sum(s['word_count'] for s in self._segment_index(transcript_data.get('transcript', [])))
         relevance = agenda_analysis.get('relevance_percentage', 0)
         
         if relevance > 70:
@@ -2774,8 +3835,8 @@ class BalancedMeetingSummarizer:
         details_data = [
             ['Meeting Details', ''],
             ['Meeting ID:', meeting_id],
-            ['Date:', datetime.now().strftime('%A, %B %d, %Y')],
-            ['Time:', datetime.now().strftime('%I:%M %p')],
+            ['Date:', build_time.strftime('%A, %B %d, %Y')],
+            ['Time:', build_time.strftime('%I:%M %p')],
             ['Duration:', duration_formatted],
             ['Participants:', str(participants)],
             ['Word Count:', f"{total_words:,}"],
@@ -2861,34 +3922,25 @@ class BalancedMeetingSummarizer:
         
         story.append(PageBreak())
 
-    def _add_balanced_sections(self, story, sections, transcript_data):
-        section_order = [
-            "1. EXECUTIVE SUMMARY",
-            "2. KEY DECISIONS & OUTCOMES",
-            "3. PARTICIPANT KEY POINTS",
-            "4. ACTION ITEMS",
-            "5. AGENDA ANALYSIS",
-            "6. KEY METRICS & DATA POINTS",
-            "7. NEXT STEPS & RECOMMENDATIONS"
-        ]
+    def _setup_section_dispatch(self):
+        # Renderers take (story, content, transcript_data); unlisted sections render as plain text
+        self._section_dispatch = {
+            "3. PARTICIPANT KEY POINTS": self._create_balanced_participant_points,
+            "4. ACTION ITEMS": lambda story, content, _: self._create_balanced_action_items(story, content),
+            "5. AGENDA ANALYSIS": lambda story, content, _: self._create_agenda_analysis_section(story, content),
+        }
+        self._default_section_renderer = lambda story, content, _: self._add_balanced_text_content(story, content)
 
-        for section_title in section_order:
+    def _add_balanced_sections(self, story, sections, transcript_data):
+        for section_title in self.SECTION_ORDER:
             if section_title in sections:
                 story.append(Paragraph(section_title, self.pro_styles['SectionHeader']))
-                story.append(Spacer(1, 8))
+                story.append(_SPACER_8)
 
-                content = sections[section_title]
-
-                if section_title == "4. ACTION ITEMS":
-                    self._create_balanced_action_items(story, content)
-                elif section_title == "3. PARTICIPANT KEY POINTS":
-                    self._create_balanced_participant_points(story, content, transcript_data)
-                elif section_title == "5. AGENDA ANALYSIS":
-                    self._create_agenda_analysis_section(story, content)
-                else:
-                    self._add_balanced_text_content(story, content)
+                render = self._section_dispatch.get(section_title, self._default_section_renderer)
+                render(story, sections[section_title], transcript_data)
 
-                story.append(Spacer(1, 15))
+                story.append(_SPACER_15)
 
     def generate_balanced_analysis(self, transcript_data, meeting_title, agenda):
         logger.info("🤖 Generating balanced meeting analysis...")
@@ -2911,7 +3963,7 @@ class BalancedMeetingSummarizer:
     def _generate_balanced_llm_analysis(self, transcripts, agenda, transcript_data, meeting_id, agenda_analysis):
         formatted_transcript = self._format_transcript_for_analysis(transcripts)
 
-        speakers = list(set(segment.get('speaker', 'Unknown') for segment in transcripts))
+        speakers = list(dict.fromkeys(s['speaker'] for s in self._segment_index(transcripts)))
         
         total_duration = transcript_data.get('total_duration', 0)
         minutes = int(total_duration // 60)
@@ -3057,7 +4109,6 @@ Approximately {agenda_analysis['relevance_percentage']:.1f}% of the discussion w
 
     def create_balanced_pdf(self, analysis, meeting_id, transcript_data, agenda_analysis, meeting_title, agenda, output_path):
         logger.info(f"📊 Creating balanced PDF for {meeting_id}...")
-
         try:
             doc = SimpleDocTemplate(
                 output_path,
@@ -3067,10 +4118,14 @@ Approximately {agenda_analysis['relevance_percentage']:.1f}% of the discussion w
                 topMargin=1.0 * inch,
                 bottomMargin=0.8 * inch
             )
+            # One timestamp for the whole document: first-page details and every page footer.
+            # Kept on the doc, not the summarizer, since one instance serves concurrent builds
+            doc.build_time = datetime.now()
 
             story = []
 
-            self._create_first_page(story, meeting_id, transcript_data, agenda_analysis, meeting_title, agenda)
+            self._create_first_page(story, meeting_id, transcript_data, agenda_analysis, meeting_title, agenda,
+                                    doc.build_time)
 
             sections = self._parse_analysis_sections(analysis)
             self._add_balanced_sections(story, sections, transcript_data)
@@ -3091,6 +4146,37 @@ Approximately {agenda_analysis['relevance_percentage']:.1f}% of the discussion w
             traceback.print_exc()
             return None
 
+    def create_balanced_pdfs(self, jobs, max_workers=None):
+        """
+        Render several meeting PDFs in parallel worker processes.
+        Each job is a tuple of create_balanced_pdf arguments; the LLM analysis must already be done.
+        Returns output paths (None for failures) in job order.
+        
+        Workers are forked, so the pool is only used from a single-threaded process (e.g. a batch
+        script) on a fork platform; forking the threaded server could copy held locks into the
+        children, and spawn would re-import this module with all its OBS/camera globals.
+        Anywhere else the jobs are rendered serially in the calling thread.
+        """
+        jobs = [tuple(job) for job in jobs]
+        if len(jobs) <= 1 or _IS_WIN or _IS_MAC or threading.active_count() > 1:
+            return [self.create_balanced_pdf(*job) for job in jobs]
+        
+        import multiprocessing
+        context = multiprocessing.get_context("fork")
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        logger.info(f"📊 Rendering {len(jobs)} PDFs on {workers} processes...")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            return list(executor.map(_render_balanced_pdf, jobs))
+
+_pdf_worker_summarizer = None
+
+def _render_balanced_pdf(job):
+    """Process-pool entry point for create_balanced_pdfs; one summarizer per worker process"""
+    global _pdf_worker_summarizer
+    if _pdf_worker_summarizer is None:
+        _pdf_worker_summarizer = BalancedMeetingSummarizer()
+    return _pdf_worker_summarizer.create_balanced_pdf(*job)
+
 def create_enhanced_transcript_pdf(transcript_data, meeting_title, output_path):
     try:
         from reportlab.lib.pagesizes import letter
@@ -3356,6 +4442,9 @@ class AdvancedAttendanceSystem:
         self.attendance_session_count = 0
     
     def initialize_models(self):
+        import torch
+        import insightface
+        from ultralytics import YOLO
         try:
             if torch.cuda.is_available():
                 providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
@@ -3496,6 +4585,7 @@ class AdvancedAttendanceSystem:
             person_data['in_frame'] = in_frame_now
     
     def process_frame_with_tracking(self, frame):
+        import torch
         current_time = datetime.now()
         
         if self.camera_zoom != 1.0:
@@ -3721,7 +4811,7 @@ class MeetingManager:
         self.audio_start_time = None
         self.audio_stop_time = None
 
-    def create_meeting(self, title: str, agenda: str = "", emails: str = None) -> Dict:
+    def create_meeting(self, title: str, agenda: str = "", emails: str = None, num_speakers: Optional[int] = None) -> Dict:
         import uuid
         
         clean_title = clean_meeting_title_for_display(title)
@@ -3747,6 +4837,7 @@ class MeetingManager:
             'original_title': title,
             'agenda': agenda,
             'emails': self.stored_emails,
+            'num_speakers': num_speakers,  # known speaker count skips the diarization k estimate
             'folder': meeting_folder,
             'folder_name': folder_name,
             'start_time': self.meeting_start_time.isoformat(),
@@ -3862,6 +4953,7 @@ class MeetingManager:
         return True
 
     def export_attendance_excel(self):
+        import xlsxwriter
         try:
             if not self.current_meeting:
                 return None
@@ -3988,7 +5080,10 @@ class MeetingManager:
             agenda = self.current_meeting.get('agenda', '')
             meeting_title = self.current_meeting.get('title', '')
             
-            transcript_data = self.diarizer.diarize_audio(audio_file, agenda, use_manual_fallback=False, meeting_title=meeting_title)
+            transcript_data = self.diarizer.diarize_audio(
+                audio_file, agenda, use_manual_fallback=False, meeting_title=meeting_title,
+                num_speakers=self.current_meeting.get('num_speakers')
+            )
             
             if transcript_data:
                 meeting_folder = self.current_meeting['folder']
@@ -4188,8 +5283,8 @@ async def startup_event():
         attendance_system.initialize_models()
         attendance_system.load_known_faces()
         
-        logger.info("[SYSTEM] Initializing diarization models...")
-        meeting_manager.diarizer._initialize_models()
+        logger.info("[SYSTEM] Warming up diarization models in background...")
+        meeting_manager.diarizer.start_background_init()
         
         logger.info("[SYSTEM] ✅ Complete meeting system initialized successfully")
     except Exception as e:
@@ -4224,11 +5319,11 @@ async def websocket_endpoint(websocket: WebSocket):
                     data = await asyncio.wait_for(websocket.receive_text(), timeout=0.1)
                     message = json.loads(data)
                     if message.get('type') == 'ping':
-                        await websocket.send_text(json.dumps({'type': 'pong'}))
+                        await websocket.send_text(orjson.dumps({'type': 'pong'}).decode())
                         continue
                 except (asyncio.TimeoutError, json.JSONDecodeError):
                     pass
-                except:
+                except Exception:
                     break
                 
                 # ONLY handle attendance camera - NEVER switch to OBS Virtual Camera
@@ -4256,7 +5351,7 @@ async def websocket_endpoint(websocket: WebSocket):
                             "message": "Attendance Camera"
                         }
                         
-                        await websocket.send_text(json.dumps(message))
+                        await websocket.send_text(orjson.dumps(message).decode())
                         await asyncio.sleep(0.05)  # ~20 FPS
                         
                     except Exception as e:
@@ -4308,7 +5403,11 @@ async def live_feed_websocket(websocket: WebSocket):
                         cap = None
                     
                     # FIX: Get OBS Virtual Camera index
-                    camera_index = CameraDetector.get_obs_camera_index()
+                    camera_index = await CameraDetector.get_obs_camera_index_async()
+                    if camera_index < 0:
+                        logger.warning("[LIVE_FEED] OBS Virtual Camera not found, is it started in OBS?")
+                        await asyncio.sleep(2.0)
+                        continue
                     logger.info(f"[LIVE_FEED] Trying OBS Virtual Camera at index {camera_index}")
                     
                     cap = cv2.VideoCapture(camera_index)
@@ -4357,7 +5456,7 @@ async def live_feed_websocket(websocket: WebSocket):
                     "message": "OBS Recording - LIVE"
                 }
                 
-                await websocket.send_text(json.dumps(message))
+                await websocket.send_text(orjson.dumps(message).decode())
                 await asyncio.sleep(0.033)  # ~30 FPS
                 
             except WebSocketDisconnect:
@@ -4414,7 +5513,8 @@ async def video_feed():
 async def create_meeting_safe(
     title: str = Form(...),
     agenda: str = Form(""),
-    emails: str = Form(None)
+    emails: str = Form(None),
+    num_speakers: Optional[int] = Form(None)
 ):
     try:
         logger.info(f"📝 Creating meeting: {title}")
@@ -4422,7 +5522,8 @@ async def create_meeting_safe(
         created_meeting = meeting_manager.create_meeting(
             title=title, 
             agenda=agenda,
-            emails=emails
+            emails=emails,
+            num_speakers=num_speakers
         )
         
         logger.info(f"✅ Meeting created successfully: {created_meeting['id']}")
@@ -4565,18 +5666,18 @@ async def start_video_recording():
                 "message": "No active meeting. Create a meeting first."
             }
         
-        # 1. Connect to OBS
-        if obs_controller.state == RecorderState.DISCONNECTED:
+        # 1. Connect to OBS (reuses the live connection, reconnects if it dropped)
+        if obs_controller.client is None:
             logger.info("🔗 Connecting to OBS...")
-            if not obs_controller.connect():
-                return {
-                    "status": "error", 
-                    "message": "Failed to connect to OBS."
-                }
+        if not await obs_controller.ensure_connected():
+            return {
+                "status": "error", 
+                "message": "Failed to connect to OBS."
+            }
         
         # 2. IMPORTANT: Ensure virtual camera is ready BEFORE recording
         logger.info("🎥 Preparing OBS Virtual Camera...")
-        obs_controller.ensure_virtual_camera_active()
+        await obs_controller.ensure_virtual_camera_active()
         
         # 3. Set recording target
         meeting_folder = meeting_manager.current_meeting['folder']
@@ -4591,7 +5692,7 @@ async def start_video_recording():
             }
         
         # 4. Start recording
-        success, message = obs_controller.start_recording()
+        success, message = await obs_controller.start_recording()
         
         if success:
             meeting_status['video_recording_active'] = True
@@ -4636,7 +5737,7 @@ async def stop_video_recording():
         logger.info("🛑 Stopping video recording with integrity checks...")
         
         # Use the enhanced stop_recording method
-        success, result = obs_controller.stop_recording()
+        success, result = await obs_controller.stop_recording()
         
         if success:
             meeting_status['video_recording_active'] = False
@@ -4747,10 +5848,10 @@ async def obs_diagnostics():
         
         if obs_controller.client:
             try:
-                record_dir = obs_controller.client.get_record_directory().record_directory
+                record_dir = obs_controller._get_record_directory()
                 common_paths.insert(0, record_dir)
                 diagnostics['obs_record_directory'] = record_dir
-            except:
+            except Exception:
                 pass
         
         for path in common_paths:
@@ -4762,7 +5863,7 @@ async def obs_diagnostics():
                         "free_gb": usage.free / (1024**3),
                         "used_percent": (usage.used / usage.total) * 100
                     }
-                except:
+                except OSError:
                     pass
         
         # Get OBS status if connected
@@ -4787,14 +5888,14 @@ async def obs_diagnostics():
             except Exception as e:
                 diagnostics['obs_status_error'] = str(e)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "success",
             "diagnostics": diagnostics
         })
         
     except Exception as e:
         logger.error(f"❌ Diagnostics error: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "error",
             "message": str(e)
         })
@@ -4878,7 +5979,7 @@ async def stop_camera():
         for ws in active_connections.copy():
             try:
                 await ws.close()
-            except:
+            except Exception:
                 pass
         active_connections.clear()
         
@@ -4982,13 +6083,10 @@ async def add_attendee(
 
             os.makedirs(AUDIO_SAMPLES_DIR, exist_ok=True)
 
-            audio_content = await audio.read()
-            if len(audio_content) == 0:
-                logger.warning("⚠️ Empty audio file uploaded")
-                return {"status": "error", "message": "Uploaded audio file is empty"}
-
+            # Decode from the spooled upload file itself rather than reading it into bytes first
+            await audio.seek(0)
             is_valid, audio_data, sample_rate, error_msg = validate_and_convert_audio(
-                audio_content,
+                audio.file,
                 audio.filename
             )
 
@@ -5053,7 +6151,7 @@ async def add_attendee(
             if not os.listdir(person_face_dir):
                 try:
                     os.rmdir(person_face_dir)
-                except:
+                except OSError:
                     pass
         return {"status": "error", "message": f"Failed to add attendee: {str(e)}"}
 
@@ -5230,7 +6328,7 @@ async def check_video_file(folder: str):
         folder_path = os.path.join(MEETINGS_DATA_DIR, folder)
         
         if not os.path.exists(folder_path):
-            return JSONResponse({"exists": False, "message": "Folder not found"})
+            return ORJSONResponse({"exists": False, "message": "Folder not found"})
         
         # Look for video files with multiple patterns
         video_patterns = [
@@ -5259,7 +6357,7 @@ async def check_video_file(folder: str):
                     
                     # If file hasn't been modified in last 0.5 seconds, it's likely complete
                     if mtime1 == mtime2 and file_size > 1024:  # At least 1KB
-                        return JSONResponse({
+                        return ORJSONResponse({
                             "exists": True,
                             "path": latest_video,
                             "filename": os.path.basename(latest_video),
@@ -5267,32 +6365,33 @@ async def check_video_file(folder: str):
                             "size_mb": file_size / (1024 * 1024)
                         })
         
-        return JSONResponse({"exists": False, "message": "No complete video file found"})
+        return ORJSONResponse({"exists": False, "message": "No complete video file found"})
         
     except Exception as e:
         logger.error(f"❌ Error checking video file: {e}")
-        return JSONResponse({"exists": False, "error": str(e)})
+        return ORJSONResponse({"exists": False, "error": str(e)})
 
 @app.get("/check_file_exists")
 async def check_file_exists(folder: str, file: str):
     try:
         file_path = os.path.join(MEETINGS_DATA_DIR, folder, file)
         if os.path.exists(file_path):
-            return JSONResponse({"exists": True, "path": file_path})
+            return ORJSONResponse({"exists": True, "path": file_path})
         else:
             folder_path = os.path.join(MEETINGS_DATA_DIR, folder)
             if os.path.exists(folder_path):
                 for f in os.listdir(folder_path):
                     if file.lower() in f.lower():
-                        return JSONResponse({"exists": True, "path": os.path.join(folder_path, f)})
-            return JSONResponse({"exists": False}, status_code=404)
+                        return ORJSONResponse({"exists": True, "path": os.path.join(folder_path, f)})
+            return ORJSONResponse({"exists": False}, status_code=404)
     except Exception as e:
         logger.error(f"❌ Error checking file: {e}")
-        return JSONResponse({"exists": False, "error": str(e)}, status_code=500)
+        return ORJSONResponse({"exists": False, "error": str(e)}, status_code=500)
 
 @app.get("/system-status")
 async def get_system_status():
     global meeting_status
+    import torch
     
     recognized_count = len([p for p in attendance_system.tracked_persons.values() if p['recognized']])
     in_frame_count = len([p for p in attendance_system.tracked_persons.values() if p['in_frame']])
@@ -5450,7 +6549,7 @@ async def get_config():
         return {"status": "error", "message": str(e)}
 
 @app.post("/api/test_diarization_enhanced")
-async def test_diarization_enhanced(audio_file: UploadFile = File(...)):
+async def test_diarization_enhanced(audio_file: UploadFile = File(...), num_speakers: Optional[int] = Form(None)):
     try:
         temp_file = f"temp_test_{uuid.uuid4().hex}.wav"
         with open(temp_file, "wb") as buffer:
@@ -5459,7 +6558,9 @@ async def test_diarization_enhanced(audio_file: UploadFile = File(...)):
         
         logger.info(f"🎙️ Testing enhanced diarization on: {audio_file.filename}")
         
-        transcript_data = meeting_manager.diarizer.diarize_audio(temp_file, "Test agenda", use_manual_fallback=False)
+        transcript_data = meeting_manager.diarizer.diarize_audio(
+            temp_file, "Test agenda", use_manual_fallback=False, num_speakers=num_speakers
+        )
         
         if os.path.exists(temp_file):
             os.remove(temp_file)
@@ -5503,7 +6604,7 @@ async def start_virtual_camera():
         
         logger.info("🎥 Manually starting OBS Virtual Camera...")
         
-        if obs_controller.start_virtual_camera():
+        if await obs_controller.start_virtual_camera():
             return {
                 "status": "success",
                 "message": "OBS Virtual Camera started"
@@ -5531,7 +6632,7 @@ async def shutdown_event():
             await stop_video_recording()
         
         # Disconnect from OBS gracefully
-        obs_controller.disconnect()
+        await obs_controller.disconnect()
         
         temp_patterns = [
             "temp_*.wav",
@@ -5558,14 +6659,14 @@ async def shutdown_event():
         try:
             attendance_system.stop_camera()
             logger.info("✅ Camera system stopped")
-        except:
+        except Exception:
             pass
         
         for ws in active_connections.copy():
             try:
                 await ws.close()
                 logger.info("✅ WebSocket connection closed")
-            except:
+            except Exception:
                 pass
         
         logger.info("✅ Shutdown cleanup completed")
@@ -5574,4 +6675,6 @@ async def shutdown_event():
 
 if __name__ == "__main__":
     logger.info("🚀 Starting Smart Meeting Manager Server with Enhanced OBS Controller...")
-    uvicorn.run(app, host=config.HOST, port=config.PORT, log_level="warning")
\ No newline at end of file
+    # loop/http "auto" pick uvloop and httptools when installed (uvloop is unavailable on Windows).
+    # Single worker: OBS, camera and meeting state live in this process.
+    uvicorn.run(app, host=config.HOST, port=config.PORT, log_level="warning", loop="auto", http="auto")
\ No newline at end of file